@@ -8,50 +8,30 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from lib.qianwen_client import QianwenClient
-from lib.baidu_client import BaiduClient
-from lib.dialogs import show_edit_dialog
-
-
-def get_translation_client(config):
-    """Get the appropriate translation client based on config.
-
-    Args:
-        config: Configuration dictionary
-
-    Returns:
-        Translation client instance
-    """
-    provider = config.get('provider', 'qianwen')
-
-    if provider == 'baidu':
-        baidu_config = config['baidu']
-        return BaiduClient(
-            api_key=baidu_config['api_key'],
-            app_id=baidu_config['app_id']
-        )
-    else:
-        # Default to qianwen
-        qianwen_config = config['qianwen']
-        return QianwenClient(
-            base_url=qianwen_config['base_url'],
-            api_key=qianwen_config['api_key'],
-            model=qianwen_config['model']
-        )
+from lib.alignment import AlignmentStore
+from lib.dialogs import CLOSED_BY_USER, show_edit_dialog
+from lib import stats
+from lib.confirm_policy import AUTO, COUNTDOWN, ConfirmPolicy
+from lib.deadline import from_config
+from lib.injection import DEFAULT_FORMAT, build_context, code_ratio, should_skip, token_report
+from lib.paths import config_path
+from lib.phrasebook import Phrasebook
+from lib.providers import get_translation_client
+from lib.selective import NON_ENGLISH_RE, prose_chars, split_prompt, translate_prompt, translate_prompt_stream
+from lib.shared_cache import open_cache
+from lib.tokens import estimate_tokens
+from lib.translation import StreamCollector, client_cache_key, confirmed_cache_key, translate_blocks
 
 
 def load_config():
     """Load configuration from config.json."""
-    config_path = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-        'config.json'
-    )
-    with open(config_path, 'r', encoding='utf-8') as f:
+    with open(config_path(), 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
 def main():
     """Main hook handler."""
+    deadline = None
     try:
         # Read input from stdin
         input_data = json.loads(sys.stdin.read())
@@ -65,6 +45,9 @@ def main():
         # Load config
         config = load_config()
 
+        # Everything below shares one time budget
+        deadline = from_config(config, 'input')
+
         # Initialize client based on provider
         client = get_translation_client(config)
 
@@ -74,38 +57,150 @@ def main():
             print(json.dumps({"result": "continue"}))
             return
 
-        # Translate to English
-        translated = client.translate(prompt, 'English')
+        # Mostly code: the translation would add more tokens than it saves
+        injection_config = config.get('injection', {})
+        if should_skip(prompt, injection_config):
+            stats.record('injection', format='skip', chars=len(prompt), prompt_tokens=estimate_tokens(prompt),
+                         code_ratio=round(code_ratio(prompt), 3))
+            print(json.dumps({"result": "continue"}))
+            return
+
+        # Translations the user confirmed are kept in the local cache only and
+        # trusted by the confirm policy; raw provider output ('cached') is not
+        cache = open_cache(config)
+        local_cache = getattr(cache, 'local', cache)
+        cache_key = client_cache_key(client, prompt, 'English')
+        confirmed_key = confirmed_cache_key(prompt, 'English')
+        cached = local_cache.get(confirmed_key) if cache else None
+        cached_outcome = 'confirmed'
+        if cached is None and cache:
+            cached = cache.get(cache_key)
+            cached_outcome = 'cached'
+
+        # Prompts made only of known phrases are translated locally; only exact
+        # phrases are trusted by the confirm policy, template fills are not
+        if cached is None and config.get('phrasebook', True):
+            phrasebook = Phrasebook.load()
+            cached = phrasebook.lookup_lines(prompt, 'English', templates=False)
+            cached_outcome = 'phrasebook'
+            if cached is None:
+                cached = phrasebook.lookup_lines(prompt, 'English')
+                cached_outcome = 'phrasebook_template'
+
+        # Sentences quoted from earlier translated answers get their English
+        # originals back; only the remaining text goes to the provider
+        source_prompt = prompt
+        aligned = 0
+        if cached is None and config.get('alignment', True):
+            source_prompt, aligned = AlignmentStore().substitute(prompt)
+            if aligned and not NON_ENGLISH_RE.search(source_prompt):
+                cached, cached_outcome = source_prompt, 'aligned'
 
         # Check if interactive mode is enabled
         interactive_input = config.get('interactive_input', True)
+        usage = None
+
+        # Decide whether this prompt needs the edit dialog, a countdown or none
+        policy = ConfirmPolicy.from_config(config) if interactive_input else None
+        decision = None
+        if policy:
+            decision = policy.decide(prompt, cached_outcome if cached is not None else 'translated')
+        show_dialog = interactive_input and (decision is None or decision.action != AUTO)
+        countdown = policy.countdown_seconds if decision and decision.action == COUNTDOWN else None
+
+        # Only send the lines with non-English prose, not pasted logs and code
+        selective = config.get('selective_input', True)
+
+        if show_dialog and cached is None and config.get('stream_input', True):
+            # Open the edit dialog right away and stream the translation into it
+            if selective:
+                stream = translate_prompt_stream(client, source_prompt, deadline=deadline)
+            else:
+                stream = client.translate_stream(source_prompt, 'English', deadline=deadline)
+            collector = StreamCollector(stream)
+            confirmed, translated, closed_by = show_edit_dialog(prompt, '', timeout=deadline.remaining(),
+                                                                stream=collector, countdown=countdown)
+
+            if collector.complete and cache:
+                cache.put(cache_key, prompt, collector.text.strip())
+            outcome = 'streamed' if collector.complete else 'partial'
+            shown = collector.text
+        else:
+            if cached is not None:
+                translated, outcome = cached, cached_outcome
+            else:
+                # Translate to English
+                if selective:
+                    translated, usage, _ = translate_prompt(
+                        client, source_prompt, cache, deadline=deadline,
+                        phrasebook=Phrasebook.load() if config.get('phrasebook', True) else None
+                    )
+                    if translated is not None and cache:
+                        cache.put(cache_key, prompt, translated)
+                else:
+                    result = translate_blocks(client, [source_prompt], 'English', cache, deadline=deadline)
+                    translated = result.blocks[0] if result.complete else None
+                    usage = result.usage
+                if translated is None:
+                    # Out of time, pass the original prompt through
+                    stats.record('input', outcome='passthrough', chars=len(prompt),
+                                 elapsed=round(deadline.elapsed(), 3), budget=deadline.budget)
+                    print(json.dumps({"result": "continue"}))
+                    return
+                outcome = 'translated'
+
+            confirmed = True
+            closed_by = None
+            shown = translated
+            if show_dialog:
+                # Show edit dialog for user to review/edit translation
+                confirmed, translated, closed_by = show_edit_dialog(prompt, translated, timeout=deadline.remaining(),
+                                                                    countdown=countdown)
+
+        if decision:
+            edited = confirmed and translated.strip() != shown.strip()
+            if decision.action == AUTO:
+                result = 'auto'
+            elif closed_by != CLOSED_BY_USER:
+                # Confirmed by the countdown, the deadline or a headless run
+                result = closed_by
+            else:
+                result = 'edited' if edited else 'accepted' if confirmed else 'cancelled'
+            # Only learn from what the user actually did
+            if closed_by == CLOSED_BY_USER:
+                policy.record(decision, confirmed, edited)
+            stats.record('confirm', action=decision.action, reason=decision.reason, result=result,
+                         **decision.signals)
+
+        if not confirmed or not translated.strip():
+            # User cancelled, continue with original prompt without translation context
+            stats.record('input', outcome='cancelled', chars=len(prompt),
+                         elapsed=round(deadline.elapsed(), 3), budget=deadline.budget)
+            print(json.dumps({"result": "continue"}))
+            return
 
-        if interactive_input:
-            # Show edit dialog for user to review/edit translation
-            confirmed, edited_translation = show_edit_dialog(prompt, translated)
-
-            if not confirmed:
-                # User cancelled, continue with original prompt without translation context
-                print(json.dumps({"result": "continue"}))
-                return
+        if closed_by == CLOSED_BY_USER and cache:
+            local_cache.put(confirmed_key, prompt, translated.strip())
 
-            translated = edited_translation
+        stats.record('input', outcome=outcome, chars=len(prompt), usage=usage,
+                     prose_chars=prose_chars(split_prompt(source_prompt)) if selective else len(source_prompt),
+                     aligned=aligned,
+                     elapsed=round(deadline.elapsed(), 3), budget=deadline.budget)
 
         # Build context showing translation
         # Note: UserPromptSubmit hooks cannot modify the prompt, only add context
         # Claude will see: original Chinese prompt + this context with translation
-        context = f"""[Translation Context]
-The user's message above is in Chinese. Here is the English translation:
-
-{translated}
-
-Please respond based on the translated meaning."""
+        fmt = injection_config.get('format', DEFAULT_FORMAT)
+        stats.record('injection', format=fmt, chars=len(prompt), prompt_tokens=estimate_tokens(prompt),
+                     code_ratio=round(code_ratio(prompt), 3), added_tokens=token_report(translated))
 
         # Output as plain text - simpler and more reliable
-        print(context)
+        print(build_context(translated, fmt))
 
     except Exception as e:
         # On error, log to stderr and continue with original prompt
+        stats.record('input', outcome='error', error=str(e),
+                     elapsed=round(deadline.elapsed(), 3) if deadline else None)
         print(f"Translation hook error: {e}", file=sys.stderr)
         print(json.dumps({"result": "continue"}))
 
@@ -9,45 +9,23 @@ import io
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from lib.qianwen_client import QianwenClient
-from lib.baidu_client import BaiduClient
 from lib.dialogs import show_confirm_dialog, show_translation_result
+from lib import stats
+from lib.deadline import from_config
+from lib.output import is_mostly_chinese, translate_output_blocks
+from lib.paths import config_path, data_path
+from lib.results import DONE, ResultStore, result_key
+from lib.transcript import read_last_assistant_message
+from lib.translation import BLOCK_SEPARATOR
 
-
-def get_translation_client(config):
-    """Get the appropriate translation client based on config.
-
-    Args:
-        config: Configuration dictionary
-
-    Returns:
-        Translation client instance
-    """
-    provider = config.get('provider', 'qianwen')
-
-    if provider == 'baidu':
-        baidu_config = config['baidu']
-        return BaiduClient(
-            api_key=baidu_config['api_key'],
-            app_id=baidu_config['app_id']
-        )
-    else:
-        # Default to qianwen
-        qianwen_config = config['qianwen']
-        return QianwenClient(
-            base_url=qianwen_config['base_url'],
-            api_key=qianwen_config['api_key'],
-            model=qianwen_config['model']
-        )
+# Share of the remaining budget spent waiting for the Stop hook's worker, so
+# translating inline (reusing the blocks it already cached) still has time
+PREPARED_WAIT_SHARE = 0.5
 
 
 def load_config():
     """Load configuration from config.json."""
-    config_path = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-        'config.json'
-    )
-    with open(config_path, 'r', encoding='utf-8') as f:
+    with open(config_path(), 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
@@ -68,7 +46,7 @@ def main():
         input_data = json.loads(raw_input)
 
         # Debug logging
-        with open('d:/code/src/claude-translator/debug_output_hook.log', 'a', encoding='utf-8') as f:
+        with open(data_path('debug_output_hook.log'), 'a', encoding='utf-8') as f:
             f.write(json.dumps(input_data, ensure_ascii=False, indent=2) + "\n\n")
 
         # Check if this is an assistant message notification
@@ -85,32 +63,30 @@ def main():
             print(json.dumps({"result": "continue"}))
             return
 
-        # Read the last line of the transcript file
-        last_assistant_message = ""
+        # Read the text blocks of the last assistant message
         try:
-            with open(transcript_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                # Iterate backwards to find the last assistant message
-                for line in reversed(lines):
-                    try:
-                        entry = json.loads(line)
-                        msg = entry.get('message', {})
-                        if msg.get('role') == 'assistant' and msg.get('type') == 'message':
-                            # Found the last assistant message
-                            content_list = msg.get('content', [])
-                            for content in content_list:
-                                if content.get('type') == 'text':
-                                    last_assistant_message += content.get('text', '')
-                            break
-                    except json.JSONDecodeError:
-                        continue
+            message_id, blocks = read_last_assistant_message(transcript_path)
         except Exception as e:
             # Log error reading transcript
-            with open('d:/code/src/claude-translator/debug_output_error.log', 'a', encoding='utf-8') as f:
+            with open(data_path('debug_output_error.log'), 'a', encoding='utf-8') as f:
                 f.write(f"Error reading transcript: {e}\n")
             print(json.dumps({"result": "continue"}))
             return
 
+        # The Stop hook prepares the translation of the finished answer
+        store = ResultStore()
+        key = None
+        if notification_type == 'idle_prompt':
+            key = result_key(transcript_path, message_id, BLOCK_SEPARATOR.join(blocks))
+
+        # Permission requests carry their own notification text, e.g.
+        # "Claude needs your permission to use Bash"
+        notification_message = input_data.get('message', '')
+        if notification_type == 'permission_prompt' and notification_message:
+            blocks.insert(0, notification_message)
+
+        last_assistant_message = BLOCK_SEPARATOR.join(blocks)
+
         if not last_assistant_message:
             # No assistant message found
             print(json.dumps({"result": "continue"}))
@@ -124,13 +100,12 @@ def main():
             print(json.dumps({"result": "continue"}))
             return
 
-        # Initialize client based on provider
-        client = get_translation_client(config)
+        # Everything below shares one time budget
+        deadline = from_config(config, 'output')
 
         # Skip if message is already primarily Chinese
         # (We check if it has significant Chinese content to avoid double translation)
-        chinese_char_count = sum(1 for c in last_assistant_message if '\u4e00' <= c <= '\u9fff')
-        if chinese_char_count > len(last_assistant_message) * 0.3:
+        if is_mostly_chinese(last_assistant_message):
             print(json.dumps({"result": "continue"}))
             return
 
@@ -141,20 +116,36 @@ def main():
             # Ask user if they want to translate
             # Use the first 500 chars for preview
             preview_msg = last_assistant_message[:500] + "..." if len(last_assistant_message) > 500 else last_assistant_message
-            if not show_confirm_dialog(preview_msg):
+            if not show_confirm_dialog(preview_msg, timeout=deadline.remaining()):
                 # User declined translation
                 print(json.dumps({"result": "continue"}))
                 return
 
         # Debug logging before translation
-        with open('d:/code/src/claude-translator/debug_output_hook.log', 'a', encoding='utf-8') as f:
+        with open(data_path('debug_output_hook.log'), 'a', encoding='utf-8') as f:
             f.write(f"Translating message (len={len(last_assistant_message)}):\n{last_assistant_message}\n\n")
 
-        # Translate to Chinese
-        translated, usage = client.translate(last_assistant_message, 'Chinese')
+        # Use the translation prepared at the Stop event, waiting for it if
+        # it is still running; translate here only if there is none
+        prepared = store.wait(key, timeout=deadline.remaining() * PREPARED_WAIT_SHARE) if key else None
+        if prepared and prepared['status'] == DONE:
+            translated = prepared['translated']
+            usage = prepared.get('usage')
+            outcome = 'prepared'
+            cache_hits = prepared.get('cache_hits', 0)
+        else:
+            translated, usage, outcome, cache_hits = translate_output_blocks(config, blocks, deadline)
+        stats.record('output', outcome=outcome, chars=len(last_assistant_message), blocks=len(blocks),
+                     cache_hits=cache_hits, usage=usage,
+                     elapsed=round(deadline.elapsed(), 3), budget=deadline.budget)
+
+        if outcome == 'passthrough':
+            # Out of time before anything was translated
+            print(json.dumps({"result": "continue"}))
+            return
 
         # Debug logging after translation
-        with open('d:/code/src/claude-translator/debug_output_hook.log', 'a', encoding='utf-8') as f:
+        with open(data_path('debug_output_hook.log'), 'a', encoding='utf-8') as f:
             f.write(f"Translation result (len={len(translated)}):\n{translated}\n")
             f.write(f"Usage: {usage}\n\n")
 
@@ -166,7 +157,8 @@ def main():
 
     except Exception as e:
         # On error, log to stderr and continue normally
-        with open('d:/code/src/claude-translator/debug_output_error.log', 'a', encoding='utf-8') as f:
+        stats.record('output', outcome='error', error=str(e))
+        with open(data_path('debug_output_error.log'), 'a', encoding='utf-8') as f:
             f.write(f"Error: {e}\n")
         print(f"Output translation hook error: {e}", file=sys.stderr)
         print(json.dumps({"result": "continue"}))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Stop hook that starts translating Claude's answer as soon as it is finished.
+
+The hook itself only extracts the last assistant message, marks its result as
+pending and hands the blocks to a detached copy of this script, so Claude Code
+is not held up. The Notification hook later shows the prepared translation.
+"""
+
+import sys
+import json
+import os
+import io
+import subprocess
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import stats
+from lib.deadline import from_config
+from lib.output import is_mostly_chinese, translate_output_blocks
+from lib.paths import config_path, data_path
+from lib.results import DONE, FAILED, PENDING, ResultStore, result_key
+from lib.transcript import read_last_assistant_message
+from lib.translation import BLOCK_SEPARATOR
+
+WORKER_FLAG = '--worker'
+
+
+def load_config():
+    """Load configuration from config.json."""
+    with open(config_path(), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def spawn_worker(job: dict):
+    """Start a detached process translating one message.
+
+    Args:
+        job: Dictionary with the result key and the message blocks
+    """
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), WORKER_FLAG],
+        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        close_fds=True, **kwargs
+    )
+    process.stdin.write(json.dumps(job, ensure_ascii=False).encode('utf-8'))
+    process.stdin.close()
+
+
+def run_worker():
+    """Translate the message read from stdin and store the result."""
+    job = json.loads(sys.stdin.buffer.read().decode('utf-8'))
+    key = job['key']
+    blocks = job['blocks']
+    store = ResultStore()
+    deadline = None
+    try:
+        config = load_config()
+        deadline = from_config(config, 'stop')
+        translated, usage, outcome, cache_hits = translate_output_blocks(config, blocks, deadline)
+        if outcome in ('passthrough', 'partial'):
+            # The Notification hook translates again; finished blocks are cached
+            store.save(key, FAILED, outcome=outcome)
+        else:
+            store.save(key, DONE, translated=translated, usage=usage, outcome=outcome, cache_hits=cache_hits)
+        stats.record('stop', outcome=outcome, chars=len(BLOCK_SEPARATOR.join(blocks)), blocks=len(blocks),
+                     cache_hits=cache_hits, usage=usage,
+                     elapsed=round(deadline.elapsed(), 3), budget=deadline.budget)
+    except Exception as e:
+        store.save(key, FAILED, error=str(e))
+        stats.record('stop', outcome='error', error=str(e))
+        with open(data_path('debug_output_error.log'), 'a', encoding='utf-8') as f:
+            f.write(f"Stop worker error: {e}\n")
+
+
+def main():
+    """Main hook handler."""
+    try:
+        try:
+            if hasattr(sys.stdin, 'buffer'):
+                sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+        except Exception:
+            pass
+
+        raw_input = sys.stdin.read().strip()
+        if raw_input.startswith('\ufeff'):
+            raw_input = raw_input[1:]
+        input_data = json.loads(raw_input)
+
+        # Stop hooks can print a decision that keeps Claude running, so this
+        # hook prints nothing and always exits 0
+        transcript_path = input_data.get('transcript_path', '')
+        if not transcript_path or not os.path.exists(transcript_path):
+            return
+
+        config = load_config()
+        if not config.get('translate_output', True) or not config.get('prepare_output', True):
+            return
+
+        message_id, blocks = read_last_assistant_message(transcript_path)
+        text = BLOCK_SEPARATOR.join(blocks)
+        if not text or is_mostly_chinese(text):
+            return
+
+        store = ResultStore()
+        key = result_key(transcript_path, message_id, text)
+        if store.load(key) is not None:
+            # Already prepared or being prepared
+            return
+
+        # Readers stop waiting for a worker that outlives its own budget
+        budget = from_config(config, 'stop').budget
+        expires = time.time() + budget + 5 if budget is not None else None
+        store.save(key, PENDING, **({'expires': expires} if expires else {}))
+        spawn_worker({'key': key, 'blocks': blocks})
+
+    except Exception as e:
+        stats.record('stop', outcome='error', error=str(e))
+        with open(data_path('debug_output_error.log'), 'a', encoding='utf-8') as f:
+            f.write(f"Stop hook error: {e}\n")
+        print(f"Stop hook error: {e}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    if WORKER_FLAG in sys.argv[1:]:
+        run_worker()
+    else:
+        main()
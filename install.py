@@ -10,6 +10,10 @@ import os
 import sys
 from pathlib import Path
 
+# Hook events used by the plugin and the scripts they run
+HOOK_EVENTS = ['UserPromptSubmit', 'Notification', 'Stop']
+HOOK_SCRIPTS = ['translate_input.py', 'translate_output.py', 'translate_stop.py']
+
 
 def get_claude_settings_path():
     """Get the path to Claude settings file."""
@@ -23,17 +27,66 @@ def get_hook_commands():
     hooks_dir = Path(__file__).parent / 'hooks'
     input_hook = hooks_dir / 'translate_input.py'
     output_hook = hooks_dir / 'translate_output.py'
+    stop_hook = hooks_dir / 'translate_stop.py'
 
     # Use forward slashes for cross-platform compatibility
     input_hook_str = str(input_hook).replace('\\', '/')
     output_hook_str = str(output_hook).replace('\\', '/')
+    stop_hook_str = str(stop_hook).replace('\\', '/')
 
     return {
         "input": f"python \"{input_hook_str}\"",
-        "output": f"python \"{output_hook_str}\""
+        "output": f"python \"{output_hook_str}\"",
+        "stop": f"python \"{stop_hook_str}\""
     }
 
 
+def is_own_hook(hook: dict) -> bool:
+    """Check whether a hook entry runs one of this plugin's scripts."""
+    command = hook.get('command', '').replace('\\', '/').rstrip('"')
+    return any(command.endswith(f"/hooks/{script}") for script in HOOK_SCRIPTS)
+
+
+def remove_hook(hooks: dict, event: str) -> bool:
+    """Remove this plugin's commands from one hook event.
+
+    Matcher groups left without hooks, and the event itself if nothing is
+    left, are removed too.
+
+    Returns:
+        True if anything was removed
+    """
+    removed = False
+    groups = []
+    for group in hooks.get(event, []):
+        kept = [hook for hook in group.get('hooks', []) if not is_own_hook(hook)]
+        if len(kept) != len(group.get('hooks', [])):
+            removed = True
+            if not kept:
+                continue
+            group = dict(group, hooks=kept)
+        groups.append(group)
+    if groups:
+        hooks[event] = groups
+    elif event in hooks:
+        del hooks[event]
+    return removed
+
+
+def add_hook(hooks: dict, event: str, command: str):
+    """Register a command for a hook event next to the user's own hooks."""
+    remove_hook(hooks, event)
+    hooks.setdefault(event, []).append({
+        "matcher": "",
+        "hooks": [
+            {
+                "type": "command",
+                "command": command
+            }
+        ]
+    })
+
+
 def install_hooks():
     """Install translation hooks to Claude settings."""
     settings_path = get_claude_settings_path()
@@ -58,30 +111,13 @@ def install_hooks():
     hooks = get_hook_commands()
 
     # Add UserPromptSubmit hook for input translation
-    settings['hooks']['UserPromptSubmit'] = [
-        {
-            "matcher": "",
-            "hooks": [
-                {
-                    "type": "command",
-                    "command": hooks["input"]
-                }
-            ]
-        }
-    ]
+    add_hook(settings['hooks'], 'UserPromptSubmit', hooks["input"])
 
     # Add Notification hook for output translation (optional)
-    settings['hooks']['Notification'] = [
-        {
-            "matcher": "",
-            "hooks": [
-                {
-                    "type": "command",
-                    "command": hooks["output"]
-                }
-            ]
-        }
-    ]
+    add_hook(settings['hooks'], 'Notification', hooks["output"])
+
+    # Add Stop hook that prepares the output translation in the background
+    add_hook(settings['hooks'], 'Stop', hooks["stop"])
 
     # Write settings back
     with open(settings_path, 'w', encoding='utf-8') as f:
@@ -91,6 +127,7 @@ def install_hooks():
     print("\nConfigured hooks:")
     print(f"  - UserPromptSubmit: {hooks['input']}")
     print(f"  - Notification: {hooks['output']}")
+    print(f"  - Stop: {hooks['stop']}")
     print("\nTo disable output translation, set 'translate_output': false in config.json")
     print("\nRestart Claude Code for changes to take effect.")
 
@@ -114,11 +151,10 @@ def uninstall_hooks():
         print("No hooks configured. Nothing to uninstall.")
         return
 
-    # Remove our hooks
+    # Remove our hooks, keeping any other hooks of the same events
     hooks_removed = False
-    for hook_name in ['UserPromptSubmit', 'Notification']:
-        if hook_name in settings['hooks']:
-            del settings['hooks'][hook_name]
+    for hook_name in HOOK_EVENTS:
+        if remove_hook(settings['hooks'], hook_name):
             hooks_removed = True
 
     if hooks_removed:
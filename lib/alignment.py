@@ -0,0 +1,198 @@
+"""Sentence alignment between Claude's answers and their translations.
+
+Every translated answer is split into aligned (Chinese, English) sentence
+pairs that are kept in a small SQLite index. When a later prompt quotes a
+sentence from a translation, the input hook puts the original English back
+instead of paying to translate it again.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache import normalize_text
+from .markdown import CJK_RE
+from .paths import data_path
+
+# Keep at most this many pairs; the oldest are dropped first
+DEFAULT_MAX_ENTRIES = 50000
+# Shorter Chinese sentences are too ambiguous to map back
+MIN_TARGET_CHARS = 4
+
+MARKUP_PREFIX_RE = re.compile(r'^(\s*(?:>\s*)*(?:#{1,6}\s+|[-*+]\s+|\d+[.)]\s+)?)')
+EN_SENTENCE_RE = re.compile(r'(?<=[.!?;])\s+(?=\S)')
+ZH_SENTENCE_RE = re.compile(r'(?<=[。！？；])(?=\S)|(?<=[.!?;])\s+(?=\S)')
+QUOTED_RE = re.compile(r'[“"「『]([^“”"「」『』\n]+)[”"」』]')
+EDGE_PUNCTUATION = ' \t。！？；，、,.!?;:：“”"「」『』‘’\'()（）'
+
+
+def normalize_sentence(text: str) -> str:
+    """Normalize a sentence for lookup, ignoring spacing and edge punctuation."""
+    return re.sub(r'\s+', ' ', normalize_text(text)).strip(EDGE_PUNCTUATION)
+
+
+def sentence_key(text: str) -> str:
+    """Index key of a normalized sentence."""
+    return hashlib.sha256(normalize_sentence(text).encode('utf-8')).hexdigest()[:32]
+
+
+def split_sentences(text: str, chinese: bool) -> List[str]:
+    """Split one line into sentences."""
+    pattern = ZH_SENTENCE_RE if chinese else EN_SENTENCE_RE
+    return [piece.strip() for piece in pattern.split(text.strip()) if piece.strip()]
+
+
+def align(source: str, translation: str) -> List[Tuple[str, str]]:
+    """Pair the sentences of an English text with those of its translation.
+
+    Lines are paired when both texts have the same number of lines, which
+    holds for the line-preserving Markdown translation. Within a line pair,
+    sentences are paired when their counts match; otherwise only the whole
+    line is paired.
+
+    Args:
+        source: Original English text
+        translation: Chinese translation
+
+    Returns:
+        List of (Chinese, English) pairs
+    """
+    source_lines = source.split('\n')
+    target_lines = translation.split('\n')
+    if len(source_lines) != len(target_lines):
+        return [(translation, source)] if '\n' not in source.strip() else []
+
+    pairs = []
+    for source_line, target_line in zip(source_lines, target_lines):
+        source_line = source_line[len(MARKUP_PREFIX_RE.match(source_line).group()):]
+        target_line = target_line[len(MARKUP_PREFIX_RE.match(target_line).group()):]
+        if not target_line.strip() or not CJK_RE.search(target_line):
+            continue
+        pairs.append((target_line, source_line))
+        source_sentences = split_sentences(source_line, False)
+        target_sentences = split_sentences(target_line, True)
+        if len(source_sentences) == len(target_sentences) > 1:
+            pairs.extend(zip(target_sentences, source_sentences))
+    return [(target.strip(), source.strip()) for target, source in pairs
+            if len(normalize_sentence(target)) >= MIN_TARGET_CHARS and CJK_RE.search(target)]
+
+
+class AlignmentStore:
+    """Chinese-to-English sentence index shared by all hook processes."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the store.
+
+        Args:
+            path: SQLite database path (defaults to data/alignment.sqlite3)
+            max_entries: Maximum number of stored pairs
+        """
+        self.path = path or data_path('alignment.sqlite3')
+        self.max_entries = max_entries
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS alignments ('
+                ' key TEXT PRIMARY KEY,'
+                ' source TEXT NOT NULL,'
+                ' created REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS alignments_created ON alignments (created)')
+            self._conn = conn
+        return self._conn
+
+    def add(self, sources: Iterable[str], translations: Iterable[str]):
+        """Align and store translated texts.
+
+        Args:
+            sources: Original English texts
+            translations: Their Chinese translations, in the same order
+        """
+        rows = {}
+        for source, translation in zip(sources, translations):
+            for target, english in align(source, translation):
+                rows[sentence_key(target)] = english
+        if not rows:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany('INSERT OR REPLACE INTO alignments (key, source, created) VALUES (?, ?, ?)',
+                             [(key, source, now) for key, source in rows.items()])
+            excess = conn.execute('SELECT COUNT(*) FROM alignments').fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute('DELETE FROM alignments WHERE key IN '
+                             '(SELECT key FROM alignments ORDER BY created LIMIT ?)', (excess,))
+            conn.commit()
+
+    def lookup_many(self, sentences: Iterable[str]) -> Dict[str, str]:
+        """Find the English originals of several Chinese sentences.
+
+        Returns:
+            Mapping of sentence to English original for every sentence found
+        """
+        keys = {}
+        for sentence in sentences:
+            if len(normalize_sentence(sentence)) >= MIN_TARGET_CHARS:
+                keys.setdefault(sentence_key(sentence), []).append(sentence)
+        if not keys:
+            return {}
+        placeholders = ','.join('?' * len(keys))
+        with self._lock:
+            rows = self._connect().execute(
+                f'SELECT key, source FROM alignments WHERE key IN ({placeholders})', list(keys)
+            ).fetchall()
+        return {sentence: source for key, source in rows for sentence in keys[key]}
+
+    def substitute(self, prompt: str) -> Tuple[str, int]:
+        """Replace quoted translations in a prompt with their English originals.
+
+        Whole lines (without quote or list markers), quoted spans and single
+        sentences are tried, in that order.
+
+        Args:
+            prompt: User prompt
+
+        Returns:
+            Tuple of (prompt with known sentences replaced, number replaced)
+        """
+        lines = prompt.split('\n')
+        candidates = []
+        for line in lines:
+            if not CJK_RE.search(line):
+                continue
+            body = line[len(MARKUP_PREFIX_RE.match(line).group()):]
+            candidates.append(body)
+            candidates.extend(match.group(1) for match in QUOTED_RE.finditer(body))
+            candidates.extend(split_sentences(body, True))
+        found = self.lookup_many(candidates)
+        if not found:
+            return prompt, 0
+
+        hits = 0
+        result = []
+        for line in lines:
+            prefix = MARKUP_PREFIX_RE.match(line).group()
+            body = line[len(prefix):]
+            if body in found:
+                result.append(prefix + found[body])
+                hits += 1
+                continue
+            for match in QUOTED_RE.finditer(body):
+                if match.group(1) in found:
+                    body = body.replace(match.group(1), found[match.group(1)])
+                    hits += 1
+            for sentence in split_sentences(body, True):
+                if sentence in found:
+                    body = body.replace(sentence, found[sentence])
+                    hits += 1
+            result.append(prefix + body)
+        return '\n'.join(result), hits
@@ -1,22 +1,83 @@
 """Baidu AI Text Translation API client."""
 
 import re
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from .deadline import DeadlineExceeded, request_timeout
+from .ratelimit import RateLimiter
+from .transport import TransportError, get_transport
+
+DEFAULT_BASE_URL = "https://fanyi-api.baidu.com/ait/api/aiTextTranslate"
+
+# Per-request size limit of the text translation API, in UTF-8 bytes
+DEFAULT_MAX_BYTES = 6000
+# Requests per second allowed for a standard account
+DEFAULT_QPS = 1
+
+# Break points used to split a single line that is larger than a request
+SPLIT_RE = re.compile(r'(?<=[.!?;。！？；，,\s])')
+# Blank-line separators between paragraphs, kept when streaming
+PARAGRAPH_RE = re.compile(r'(\n\s*\n)')
+
+
+def split_long_line(line: str, max_bytes: int) -> list:
+    """Split one line into pieces that each fit in a request.
+
+    Pieces end at sentence punctuation or whitespace where possible, so
+    joining them gives back the original line.
+
+    Args:
+        line: Line to split
+        max_bytes: Maximum UTF-8 size of one piece
+
+    Returns:
+        List of pieces
+    """
+    pieces = []
+    current = ''
+    for part in SPLIT_RE.split(line):
+        while len(part.encode('utf-8')) > max_bytes:
+            # No break point, cut on a character boundary
+            cut = len(part.encode('utf-8')[:max_bytes].decode('utf-8', 'ignore'))
+            if current:
+                pieces.append(current)
+                current = ''
+            pieces.append(part[:cut])
+            part = part[cut:]
+        if len((current + part).encode('utf-8')) > max_bytes:
+            pieces.append(current)
+            current = ''
+        current += part
+    if current:
+        pieces.append(current)
+    return pieces
 
 
 class BaiduClient:
     """Client for Baidu AI Text Translation services."""
 
-    def __init__(self, api_key: str, app_id: str):
+    provider = 'baidu'
+    model = 'aiTextTranslate'
+
+    def __init__(self, api_key: str, app_id: str, max_bytes: int = DEFAULT_MAX_BYTES, qps: float = DEFAULT_QPS,
+                 base_url: str = DEFAULT_BASE_URL, transport=None):
         """Initialize the Baidu client.
 
         Args:
             api_key: API authentication key (Bearer token)
             app_id: App ID for the translation service
+            max_bytes: Maximum UTF-8 size of the text sent in one request
+            qps: Requests per second allowed for the account
+            base_url: Endpoint of the text translation API
+            transport: HTTP transport (see lib/transport.py), the default one if None
         """
         self.api_key = api_key.strip()
         self.app_id = app_id.strip()
-        self.base_url = "https://fanyi-api.baidu.com/ait/api/aiTextTranslate"
+        self.base_url = base_url
+        self.max_bytes = max_bytes
+        self.qps = qps
+        self.rate_limiter = RateLimiter(qps)
+        self.transport = transport or get_transport()
 
     def detect_chinese(self, text: str) -> bool:
         """Check if text contains Chinese characters."""
@@ -29,16 +90,123 @@ class BaiduClient:
         chinese_pattern = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf\u20000-\u2a6df]')
         return bool(chinese_pattern.search(text))
 
-    def translate(self, text: str, target_lang: str) -> tuple[str, dict]:
+    def translate(self, text: str, target_lang: str, deadline=None) -> tuple[str, dict]:
         """Translate text to target language using Baidu AI Text Translate API.
 
+        Blank lines, line order and indentation are reconstructed exactly;
+        only the non-blank lines are sent, split into chunks under the
+        request size limit.
+
         Args:
             text: Text to translate
             target_lang: Target language ('English' or 'Chinese')
+            deadline: Optional Deadline capping the request timeouts
 
         Returns:
             Tuple of (Translated text, Usage dict or None)
         """
+        lines = text.split("\n")
+        indexes = [i for i, line in enumerate(lines) if line.strip()]
+        translated = self._translate_lines([lines[i].strip() for i in indexes], target_lang, deadline)
+
+        for i, dst in zip(indexes, translated):
+            indent = lines[i][:len(lines[i]) - len(lines[i].lstrip())]
+            lines[i] = indent + dst
+        return "\n".join(lines), None
+
+    def translate_stream(self, text: str, target_lang: str, deadline=None):
+        """Translate text paragraph by paragraph, yielding each as it is done.
+
+        Paragraphs are submitted together so they are fetched in parallel
+        within the QPS limit, and yielded in their original order.
+
+        Args:
+            text: Text to translate
+            target_lang: Target language ('English' or 'Chinese')
+            deadline: Optional Deadline capping the request timeouts
+
+        Yields:
+            Pieces of the translated text, in order
+        """
+        parts = PARAGRAPH_RE.split(text)
+        workers = max(1, int(self.qps) or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.translate, part, target_lang, deadline) if part.strip() else None
+                for part in parts
+            ]
+            for part, future in zip(parts, futures):
+                yield future.result()[0] if future else part
+
+    def translate_batch(self, texts: list, target_lang: str, deadline=None) -> tuple:
+        """Translate several single-line segments.
+
+        Baidu translates line by line, so segments are sent as separate lines
+        of as few requests as the size limit allows.
+
+        Args:
+            texts: Single-line texts to translate
+            target_lang: Target language ('English' or 'Chinese')
+            deadline: Optional Deadline capping every request timeout
+
+        Returns:
+            Tuple of (list of translated texts in input order, Usage dict or None)
+        """
+        return self._translate_lines([text.strip() for text in texts], target_lang, deadline), None
+
+    def _translate_lines(self, lines: list, target_lang: str, deadline=None) -> list:
+        """Translate non-blank lines, chunked by size and sent in parallel.
+
+        Args:
+            lines: Stripped, non-blank lines
+            target_lang: Target language ('English' or 'Chinese')
+            deadline: Optional Deadline
+
+        Returns:
+            Translated lines in input order
+        """
+        # Lines larger than one request are split into pieces and joined again afterwards
+        pieces = []
+        owners = []
+        for i, line in enumerate(lines):
+            for piece in split_long_line(line, self.max_bytes):
+                pieces.append(piece.strip())
+                owners.append(i)
+
+        chunks = []
+        size = 0
+        for piece in pieces:
+            piece_size = len(piece.encode('utf-8')) + 1
+            if not chunks or size + piece_size > self.max_bytes:
+                chunks.append([])
+                size = 0
+            chunks[-1].append(piece)
+            size += piece_size
+
+        if len(chunks) == 1:
+            results = [self._request(chunks[0], target_lang, deadline)]
+        else:
+            workers = max(1, min(len(chunks), int(self.qps) or 1))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(lambda chunk: self._request(chunk, target_lang, deadline), chunks))
+
+        joiner = '' if target_lang.lower() == 'chinese' else ' '
+        translated = [[] for _ in lines]
+        for owner, dst in zip(owners, (dst for chunk in results for dst in chunk)):
+            translated[owner].append(dst)
+        return [joiner.join(parts) for parts in translated]
+
+    def _request(self, lines: list, target_lang: str, deadline=None) -> list:
+        """Send one chunk of lines and check the result lines up with it.
+
+        Args:
+            lines: Stripped, non-blank lines forming one request
+            target_lang: Target language ('English' or 'Chinese')
+            deadline: Optional Deadline
+
+        Returns:
+            Translated lines in input order
+        """
         # Detect languages
         from_lang = 'auto'
         if target_lang.lower() == 'chinese':
@@ -55,30 +223,55 @@ class BaiduClient:
             "appid": self.app_id,
             "from": from_lang,
             "to": to_lang,
-            "q": text
+            "q": "\n".join(lines)
         }
 
         try:
-            response = requests.post(self.base_url, headers=headers, json=payload, timeout=30)
-            response.raise_for_status()
+            self.rate_limiter.acquire(deadline)
+            response = self.transport.post_json(self.base_url, payload, headers=headers,
+                                                timeout=request_timeout(deadline))
             result = response.json()
 
-            # Handle errors
-            if "error_code" in result and result["error_code"] != 0:
-                 # Note: Success usually implies no error_code or error_code=0, but check docs if available.
-                 # The failure case had error_code: 54001.
-                 # The success case had no error_code in my debug output? 
-                 # Wait, looking at debug output: {"from":"zh","to":"en","trans_result":[{"src":"你好","dst":"Hello"}]}
-                 # It doesn't have error_code on success.
+            # Success responses carry no error_code, failures e.g. 54001
+            if "error_code" in result and result["error_code"] not in (0, "0"):
                 raise Exception(f"Baidu API error: {result['error_code']} - {result.get('error_msg')}")
 
-            # Extract result
             trans_result = result.get("trans_result", [])
-            translated_lines = [item["dst"] for item in trans_result]
-            
-            return "\n".join(translated_lines), None
+            return self._align(lines, trans_result)
 
-        except requests.exceptions.RequestException as e:
+        except TransportError as e:
+            if deadline and deadline.expired():
+                raise DeadlineExceeded(f"Baidu Translation API timed out: {e}")
             raise Exception(f"Baidu Translation API error: {e}")
         except (KeyError, IndexError, ValueError) as e:
             raise Exception(f"Invalid Baidu API response: {e}")
+
+    @staticmethod
+    def _align(lines: list, trans_result: list) -> list:
+        """Match trans_result entries to input lines using their src field.
+
+        Args:
+            lines: Lines that were sent
+            trans_result: Entries returned by the API
+
+        Returns:
+            Translated lines in input order
+
+        Raises:
+            ValueError: If an input line has no matching result
+        """
+        sources = [item["src"].strip() for item in trans_result]
+        if sources == lines:
+            return [item["dst"] for item in trans_result]
+
+        # Order or count differs, look each line up by its source text
+        by_source = {}
+        for item in trans_result:
+            by_source.setdefault(item["src"].strip(), []).append(item["dst"])
+        aligned = []
+        for line in lines:
+            candidates = by_source.get(line)
+            if not candidates:
+                raise ValueError(f"no translation returned for line: {line[:50]!r}")
+            aligned.append(candidates.pop(0) if len(candidates) > 1 else candidates[0])
+        return aligned
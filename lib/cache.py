@@ -0,0 +1,139 @@
+"""Persistent translation cache backed by SQLite."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .paths import data_path
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so that trivially different inputs share a cache entry.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        NFC-normalized text with unified line endings and no trailing whitespace
+    """
+    text = unicodedata.normalize('NFC', text).replace('\r\n', '\n')
+    return '\n'.join(line.rstrip() for line in text.split('\n')).strip()
+
+
+def cache_key(text: str, target_lang: str, provider: str, model: str) -> str:
+    """Build the cache key for a translation request.
+
+    Args:
+        text: Source text
+        target_lang: Target language ('English' or 'Chinese')
+        provider: Translation provider name
+        model: Model name used by the provider
+
+    Returns:
+        Hex digest identifying the request
+    """
+    raw = '\0'.join([provider or '', model or '', target_lang.lower(), normalize_text(text)])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """Translation cache shared by all hook processes on this machine."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database path (defaults to data/cache.sqlite3)
+        """
+        self.path = path or data_path('cache.sqlite3')
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS translations ('
+                ' key TEXT PRIMARY KEY,'
+                ' source TEXT,'
+                ' translation TEXT NOT NULL,'
+                ' created REAL NOT NULL,'
+                ' hits INTEGER NOT NULL DEFAULT 0)'
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a single translation by key."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Look up several translations at once.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Mapping of key to translation for every key that was found
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        placeholders = ','.join('?' * len(keys))
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                f'SELECT key, translation FROM translations WHERE key IN ({placeholders})',
+                keys
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    'UPDATE translations SET hits = hits + 1 WHERE key = ?',
+                    [(row[0],) for row in rows]
+                )
+                conn.commit()
+        return dict(rows)
+
+    def put(self, key: str, source: str, translation: str):
+        """Store a single translation."""
+        self.put_many({key: (source, translation)})
+
+    def put_many(self, items: Dict[str, tuple]):
+        """Store several translations at once.
+
+        Args:
+            items: Mapping of key to (source, translation)
+        """
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                'INSERT OR REPLACE INTO translations (key, source, translation, created, hits) '
+                'VALUES (?, ?, ?, ?, COALESCE((SELECT hits FROM translations WHERE key = ?), 0))',
+                [(key, source, translation, now, key) for key, (source, translation) in items.items()]
+            )
+            conn.commit()
+
+    def frequent(self, min_hits: int, max_chars: int) -> List[Tuple[str, str, int]]:
+        """List short, frequently reused translations.
+
+        Args:
+            min_hits: Minimum number of cache hits
+            max_chars: Maximum source length
+
+        Returns:
+            List of (source, translation, hits), most used first
+        """
+        with self._lock:
+            return self._connect().execute(
+                'SELECT source, translation, hits FROM translations '
+                'WHERE hits >= ? AND source IS NOT NULL AND length(source) <= ? '
+                'ORDER BY hits DESC',
+                (min_hits, max_chars)
+            ).fetchall()
@@ -0,0 +1,180 @@
+"""Per-prompt decision whether the edit dialog is worth the wait."""
+
+import json
+import os
+import time
+from collections import namedtuple
+from typing import Optional
+
+from .injection import code_ratio
+from .paths import data_path
+
+# Actions the policy can choose
+DIALOG = 'dialog'
+COUNTDOWN = 'countdown'
+AUTO = 'auto'
+
+# Translation sources that were confirmed by the user, curated or are Claude's
+# own words; cached provider output ('cached') and phrasebook template fills
+# ('phrasebook_template') are not trusted
+TRUSTED_SOURCES = ('confirmed', 'phrasebook', 'aligned')
+
+# Weight of the newest outcome in the acceptance rate
+DEFAULT_ALPHA = 0.1
+DEFAULT_AUTO_MAX_CHARS = 200
+DEFAULT_COUNTDOWN_MAX_CHARS = 1000
+DEFAULT_AUTO_ACCEPTANCE = 0.9
+DEFAULT_COUNTDOWN_ACCEPTANCE = 0.7
+DEFAULT_MIN_SAMPLES = 10
+DEFAULT_COUNTDOWN_SECONDS = 3
+
+# Result of ConfirmPolicy.decide()
+Decision = namedtuple('Decision', ['action', 'reason', 'signals'])
+
+
+class AcceptanceStore:
+    """How often translations shown in the dialog were accepted unedited.
+
+    Kept as an exponentially weighted rate in data/acceptance.json, shared
+    by all hook processes.
+    """
+
+    def __init__(self, path: Optional[str] = None, alpha: float = DEFAULT_ALPHA):
+        """Initialize the store.
+
+        Args:
+            path: JSON file path (defaults to data/acceptance.json)
+            alpha: EWMA smoothing factor
+        """
+        self.path = path or data_path('acceptance.json')
+        self.alpha = alpha
+
+    def get(self) -> dict:
+        """Return {'rate': ..., 'samples': ...}, empty if nothing was recorded."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def record(self, unedited: bool):
+        """Record whether the user accepted a translation without changes."""
+        entry = self.get()
+        value = 1.0 if unedited else 0.0
+        previous = entry.get('rate')
+        entry['rate'] = value if previous is None else self.alpha * value + (1 - self.alpha) * previous
+        entry['samples'] = entry.get('samples', 0) + 1
+        entry['updated'] = time.time()
+        try:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+class ConfirmPolicy:
+    """Chooses between the edit dialog, a countdown and auto-confirmation.
+
+    Length limits apply to the prose part of the prompt (code and pasted
+    output are passed through unchanged, so they carry little risk):
+
+    - user-confirmed, exact phrasebook or aligned translations up to
+      auto_max_chars: auto
+    - otherwise, with at least min_samples past dialogs, an acceptance rate
+      of auto_acceptance and up to auto_max_chars: auto
+    - trusted sources, or an acceptance rate of countdown_acceptance, up to
+      countdown_max_chars: countdown
+    - everything else: dialog
+    """
+
+    def __init__(self, store: AcceptanceStore, auto_max_chars: int = DEFAULT_AUTO_MAX_CHARS,
+                 countdown_max_chars: int = DEFAULT_COUNTDOWN_MAX_CHARS,
+                 auto_acceptance: float = DEFAULT_AUTO_ACCEPTANCE,
+                 countdown_acceptance: float = DEFAULT_COUNTDOWN_ACCEPTANCE,
+                 min_samples: int = DEFAULT_MIN_SAMPLES, countdown_seconds: float = DEFAULT_COUNTDOWN_SECONDS):
+        """Initialize the policy.
+
+        Args:
+            store: History of dialog outcomes
+            auto_max_chars: Longest prose auto-confirmed
+            countdown_max_chars: Longest prose confirmed after a countdown
+            auto_acceptance: Acceptance rate needed to auto-confirm
+            countdown_acceptance: Acceptance rate needed for a countdown
+            min_samples: Dialog outcomes needed before the rate is trusted
+            countdown_seconds: Length of the countdown
+        """
+        self.store = store
+        self.auto_max_chars = auto_max_chars
+        self.countdown_max_chars = countdown_max_chars
+        self.auto_acceptance = auto_acceptance
+        self.countdown_acceptance = countdown_acceptance
+        self.min_samples = min_samples
+        self.countdown_seconds = countdown_seconds
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['ConfirmPolicy']:
+        """Create the policy from the 'confirm_policy' section of config.json.
+
+        Returns:
+            The policy, or None if it is disabled (the dialog is always shown)
+        """
+        policy_config = config.get('confirm_policy', {})
+        if not policy_config.get('enabled', True):
+            return None
+        return cls(
+            AcceptanceStore(),
+            auto_max_chars=policy_config.get('auto_max_chars', DEFAULT_AUTO_MAX_CHARS),
+            countdown_max_chars=policy_config.get('countdown_max_chars', DEFAULT_COUNTDOWN_MAX_CHARS),
+            auto_acceptance=policy_config.get('auto_acceptance', DEFAULT_AUTO_ACCEPTANCE),
+            countdown_acceptance=policy_config.get('countdown_acceptance', DEFAULT_COUNTDOWN_ACCEPTANCE),
+            min_samples=policy_config.get('min_samples', DEFAULT_MIN_SAMPLES),
+            countdown_seconds=policy_config.get('countdown_seconds', DEFAULT_COUNTDOWN_SECONDS)
+        )
+
+    def decide(self, prompt: str, source: str) -> Decision:
+        """Decide how to confirm the translation of one prompt.
+
+        Args:
+            prompt: Original prompt
+            source: Where the translation comes from ('confirmed', 'cached',
+                'phrasebook', 'phrasebook_template', 'aligned' or 'translated')
+
+        Returns:
+            Decision with the action, a short reason and the signals used
+        """
+        ratio = code_ratio(prompt)
+        prose_chars = round(len(prompt) * (1 - ratio))
+        history = self.store.get()
+        rate = history.get('rate')
+        samples = history.get('samples', 0)
+        signals = {'chars': len(prompt), 'prose_chars': prose_chars, 'code_ratio': round(ratio, 3),
+                   'source': source, 'acceptance': round(rate, 3) if rate is not None else None,
+                   'samples': samples}
+
+        trusted = source in TRUSTED_SOURCES
+        known = rate is not None and samples >= self.min_samples
+        if prose_chars <= self.auto_max_chars:
+            if trusted:
+                return Decision(AUTO, 'trusted source', signals)
+            if known and rate >= self.auto_acceptance:
+                return Decision(AUTO, 'high acceptance', signals)
+        if prose_chars <= self.countdown_max_chars:
+            if trusted:
+                return Decision(COUNTDOWN, 'trusted source', signals)
+            if known and rate >= self.countdown_acceptance:
+                return Decision(COUNTDOWN, 'acceptance', signals)
+        if not known:
+            return Decision(DIALOG, 'no history', signals)
+        return Decision(DIALOG, 'long or low acceptance', signals)
+
+    def record(self, decision: Decision, confirmed: bool, edited: bool):
+        """Learn from a prompt whose translation the user confirmed or cancelled.
+
+        Auto-confirmed prompts are not recorded: nobody looked at them. The
+        caller must not record dialogs closed by the countdown or the
+        deadline either, or the policy would reinforce itself.
+        """
+        if decision.action != AUTO:
+            self.store.record(confirmed and not edited)
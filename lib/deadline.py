@@ -0,0 +1,86 @@
+"""Time budget shared by all work done in one hook invocation."""
+
+import time
+from typing import Optional
+
+# Per-request timeout used when no deadline applies
+DEFAULT_TIMEOUT = 30
+
+# Hook budget in seconds, below Claude Code's default 60 second hook timeout
+DEFAULT_BUDGET = 50
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the hook's time budget has run out."""
+
+
+class Deadline:
+    """Absolute point in time by which a hook must have finished its work."""
+
+    def __init__(self, seconds: Optional[float]):
+        """Initialize the deadline.
+
+        Args:
+            seconds: Budget in seconds from now, or None for no limit
+        """
+        self.started = time.monotonic()
+        self.budget = seconds
+        self.expires = None if seconds is None else self.started + seconds
+
+    def elapsed(self) -> float:
+        """Seconds spent since the deadline was created."""
+        return time.monotonic() - self.started
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None if unlimited."""
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        """Check whether the budget has run out."""
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def timeout(self, default: float = DEFAULT_TIMEOUT) -> float:
+        """Timeout for the next network call, capped by the remaining budget.
+
+        Args:
+            default: Timeout to use when plenty of budget is left
+
+        Returns:
+            Timeout in seconds
+
+        Raises:
+            DeadlineExceeded: If no budget is left
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if remaining <= 0:
+            raise DeadlineExceeded("Hook time budget exhausted")
+        return min(default, remaining)
+
+
+def request_timeout(deadline: Optional[Deadline], default: float = DEFAULT_TIMEOUT) -> float:
+    """Timeout for a network call made under an optional deadline."""
+    return deadline.timeout(default) if deadline else default
+
+
+def check(deadline: Optional[Deadline]):
+    """Raise DeadlineExceeded if the optional deadline has passed."""
+    if deadline and deadline.expired():
+        raise DeadlineExceeded("Hook time budget exhausted")
+
+
+def from_config(config: dict, hook: str) -> Deadline:
+    """Create the deadline for a hook invocation from config.json.
+
+    Args:
+        config: Configuration dictionary
+        hook: Hook name ('input', 'output' or 'stop')
+
+    Returns:
+        Deadline starting now
+    """
+    budget = config.get('budget', {})
+    return Deadline(budget.get(f'{hook}_seconds', DEFAULT_BUDGET))
@@ -1,22 +1,113 @@
 #!/usr/bin/env python3
 """Interactive dialogs for translation hooks using tkinter."""
 
+import math
+import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import scrolledtext
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
+
+from .paths import HEADLESS_ENV
+
+# Marks the end of a translation stream in the dialog's queue
+_STREAM_DONE = object()
+
+# How the edit dialog was closed
+CLOSED_BY_USER = 'user'
+CLOSED_BY_COUNTDOWN = 'countdown'
+CLOSED_BY_TIMEOUT = 'timeout'
+CLOSED_BY_HEADLESS = 'headless'
+
+
+def is_headless() -> bool:
+    """Check whether dialogs are disabled (CLAUDE_TRANSLATOR_HEADLESS=1).
+
+    Headless dialogs confirm immediately without showing a window; used when
+    hooks are driven by scripts such as the load-test harness.
+    """
+    return os.environ.get(HEADLESS_ENV) == '1'
 
 
 class TranslationEditDialog:
     """Dialog for editing translated prompts."""
 
-    def __init__(self, original: str, translated: str):
+    def __init__(self, original: str, translated: str, timeout: Optional[float] = None,
+                 stream: Optional[Iterable[str]] = None, countdown: Optional[float] = None):
         self.original = original
         self.translated = translated
+        self.timeout = timeout
+        self.stream = stream
+        self.countdown = countdown
         self.result: Optional[str] = None
         self.cancelled = False
-
-    def show(self) -> Tuple[bool, str]:
-        """Show the edit dialog. Returns (confirmed, edited_text)."""
+        self.closed_by = CLOSED_BY_USER
+        self._countdown_job = None
+
+    def _start_countdown(self, root, countdown_label, on_confirm):
+        """Confirm automatically once the countdown reaches zero."""
+
+        def tick(remaining):
+            if remaining <= 0:
+                on_confirm(CLOSED_BY_COUNTDOWN)
+                return
+            countdown_label.config(
+                text=f"Confirming in {remaining}s - press a key or click to edit / {remaining} 秒后自动确认，按键或点击可编辑"
+            )
+            self._countdown_job = root.after(1000, tick, remaining - 1)
+
+        tick(math.ceil(self.countdown))
+
+    def _stop_countdown(self, root, countdown_label):
+        """Stop the countdown when the user starts interacting."""
+        if self._countdown_job is not None:
+            root.after_cancel(self._countdown_job)
+            self._countdown_job = None
+            countdown_label.config(text="Auto-confirm stopped / 已停止自动确认")
+
+    def _start_stream(self, root, trans_text, status_label, on_done=None):
+        """Append streamed translation pieces to the edit area as they arrive.
+
+        The stream is consumed on a background thread; pieces are inserted
+        from the Tk event loop at a mark that follows the streamed text, so
+        the user can edit what has already arrived in the meantime.
+        """
+        pieces = queue.Queue()
+
+        def consume():
+            try:
+                for piece in self.stream:
+                    pieces.put(piece)
+                pieces.put(_STREAM_DONE)
+            except Exception as e:
+                pieces.put(e)
+
+        threading.Thread(target=consume, daemon=True).start()
+        trans_text.mark_set('stream_end', 'end-1c')
+        trans_text.mark_gravity('stream_end', 'right')
+
+        def poll():
+            try:
+                while True:
+                    item = pieces.get_nowait()
+                    if item is _STREAM_DONE:
+                        status_label.config(text="Translation complete / 翻译完成")
+                        if on_done:
+                            on_done()
+                        return
+                    if isinstance(item, Exception):
+                        status_label.config(text=f"Translation stopped / 翻译中断: {item}", fg='#f44336')
+                        return
+                    trans_text.insert('stream_end', item)
+            except queue.Empty:
+                pass
+            root.after(50, poll)
+
+        root.after(50, poll)
+
+    def show(self) -> Tuple[bool, str, str]:
+        """Show the edit dialog. Returns (confirmed, edited_text, closed_by)."""
         root = tk.Tk()
         root.title("Edit English Translation / 编辑英文翻译")
         root.geometry("700x500")
@@ -59,6 +150,28 @@ class TranslationEditDialog:
         )
         trans_label.pack(anchor='w', padx=10, pady=(0, 2))
 
+        # Streaming progress
+        if self.stream is not None:
+            status_label = tk.Label(
+                root,
+                text="Translating... you can start editing / 翻译中... 可以开始编辑",
+                font=('Microsoft YaHei', 9),
+                bg='#f0f0f0',
+                fg='#666666'
+            )
+            status_label.pack(anchor='w', padx=10, pady=(0, 2))
+
+        # Auto-confirm countdown chosen by the confirm policy
+        if self.countdown is not None:
+            countdown_label = tk.Label(
+                root,
+                text="",
+                font=('Microsoft YaHei', 9),
+                bg='#f0f0f0',
+                fg='#2196F3'
+            )
+            countdown_label.pack(anchor='w', padx=10, pady=(0, 2))
+
         # Translated text edit area
         trans_text = scrolledtext.ScrolledText(
             root,
@@ -75,9 +188,10 @@ class TranslationEditDialog:
         btn_frame = tk.Frame(root, bg='#f0f0f0')
         btn_frame.pack(pady=10)
 
-        def on_confirm():
+        def on_confirm(closed_by=CLOSED_BY_USER):
             self.result = trans_text.get('1.0', 'end-1c')
             self.cancelled = False
+            self.closed_by = closed_by
             root.destroy()
 
         def on_cancel():
@@ -110,10 +224,28 @@ class TranslationEditDialog:
         )
         cancel_btn.pack(side='left', padx=10)
 
+        # The countdown starts once the whole translation is shown
+        start_countdown = None
+        if self.countdown is not None:
+            def start_countdown():
+                self._start_countdown(root, countdown_label, on_confirm)
+
+            trans_text.bind('<Key>', lambda e: self._stop_countdown(root, countdown_label), add='+')
+            trans_text.bind('<Button>', lambda e: self._stop_countdown(root, countdown_label), add='+')
+
+        if self.stream is not None:
+            self._start_stream(root, trans_text, status_label, on_done=start_countdown)
+        elif start_countdown:
+            start_countdown()
+
         # Keyboard bindings
         root.bind('<Return>', lambda e: on_confirm() if e.state & 0x4 else None)  # Ctrl+Enter
         root.bind('<Escape>', lambda e: on_cancel())
 
+        # Confirm the current text before the hook runs out of time
+        if self.timeout is not None:
+            root.after(int(self.timeout * 1000), on_confirm, CLOSED_BY_TIMEOUT)
+
         # Keep window on top
         root.attributes('-topmost', True)
         root.lift()
@@ -122,15 +254,16 @@ class TranslationEditDialog:
         root.mainloop()
 
         if self.cancelled:
-            return (False, self.translated)
-        return (True, self.result if self.result else self.translated)
+            return (False, self.translated, self.closed_by)
+        return (True, self.result if self.result else self.translated, self.closed_by)
 
 
 class TranslationConfirmDialog:
     """Dialog for confirming whether to translate output."""
 
-    def __init__(self, message_preview: str):
+    def __init__(self, message_preview: str, timeout: Optional[float] = None):
         self.message_preview = message_preview
+        self.timeout = timeout
         self.confirmed = False
 
     def show(self) -> bool:
@@ -227,6 +360,10 @@ class TranslationConfirmDialog:
         root.bind('<Return>', lambda e: on_yes())
         root.bind('<Escape>', lambda e: on_no())
 
+        # Decline when there is no time left to translate
+        if self.timeout is not None:
+            root.after(int(self.timeout * 1000), on_no)
+
         # Keep window on top
         root.attributes('-topmost', True)
         root.lift()
@@ -237,34 +374,47 @@ class TranslationConfirmDialog:
         return self.confirmed
 
 
-def show_edit_dialog(original: str, translated: str) -> Tuple[bool, str]:
+def show_edit_dialog(original: str, translated: str, timeout: Optional[float] = None,
+                     stream: Optional[Iterable[str]] = None,
+                     countdown: Optional[float] = None) -> Tuple[bool, str, str]:
     """
     Show translation edit dialog.
 
     Args:
         original: Original text in source language
-        translated: Translated text
+        translated: Translated text (initial text when streaming)
+        timeout: Seconds after which the current text is confirmed automatically
+        stream: Optional iterable of translation pieces appended as they arrive
+        countdown: Optional seconds after which the translation is confirmed
+            unless the user starts editing (counted from the end of the stream)
 
     Returns:
-        Tuple of (confirmed, edited_text)
+        Tuple of (confirmed, edited_text, closed_by)
         - confirmed: True if user confirmed, False if cancelled
         - edited_text: The edited translation (or original translation if cancelled)
+        - closed_by: CLOSED_BY_USER, or CLOSED_BY_COUNTDOWN / CLOSED_BY_TIMEOUT /
+          CLOSED_BY_HEADLESS when it was confirmed without the user
     """
-    dialog = TranslationEditDialog(original, translated)
+    if is_headless():
+        return (True, translated + ''.join(stream or []), CLOSED_BY_HEADLESS)
+    dialog = TranslationEditDialog(original, translated, timeout, stream, countdown)
     return dialog.show()
 
 
-def show_confirm_dialog(message_preview: str) -> bool:
+def show_confirm_dialog(message_preview: str, timeout: Optional[float] = None) -> bool:
     """
     Show translation confirmation dialog.
 
     Args:
         message_preview: Preview of the message to translate
+        timeout: Seconds after which the dialog is declined automatically
 
     Returns:
         True if user wants to translate, False otherwise
     """
-    dialog = TranslationConfirmDialog(message_preview)
+    if is_headless():
+        return True
+    dialog = TranslationConfirmDialog(message_preview, timeout)
     return dialog.show()
 
 
@@ -400,6 +550,8 @@ def show_translation_result(original: str, translated: str, usage: dict = None):
     """
     Show translation result dialog.
     """
+    if is_headless():
+        return
     dialog = TranslationResultDialog(original, translated, usage)
     dialog.show()
 
@@ -407,11 +559,11 @@ def show_translation_result(original: str, translated: str, usage: dict = None):
 if __name__ == '__main__':
     # Test the dialogs
     print("Testing edit dialog...")
-    confirmed, text = show_edit_dialog(
+    confirmed, text, closed_by = show_edit_dialog(
         "这是一个测试消息",
         "This is a test message"
     )
-    print(f"Confirmed: {confirmed}, Text: {text}")
+    print(f"Confirmed: {confirmed}, Text: {text}, Closed by: {closed_by}")
 
     print("\nTesting confirm dialog...")
     result = show_confirm_dialog("This is a sample response from Claude that could be translated.")
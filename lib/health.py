@@ -0,0 +1,120 @@
+"""Persisted provider health tracking with a circuit breaker."""
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from .paths import data_path
+
+# Weight of the newest observation in the moving averages
+DEFAULT_ALPHA = 0.3
+# Consecutive failures that open the circuit
+DEFAULT_FAILURE_THRESHOLD = 3
+# Seconds traffic is kept away from a provider once its circuit opens
+DEFAULT_COOLDOWN = 60
+
+# Serializes updates from the provider threads of one process
+_write_lock = threading.Lock()
+
+
+class HealthStore:
+    """Per provider/model health shared between hook processes.
+
+    The store is a small JSON file read once per process. Every call updates
+    the entry of the provider it used; the file is re-read just before writing
+    so concurrent hooks only race on the same provider entry. Threads of one
+    process update it one at a time.
+    """
+
+    def __init__(self, path: Optional[str] = None, alpha: float = DEFAULT_ALPHA,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, cooldown: float = DEFAULT_COOLDOWN):
+        """Initialize the store.
+
+        Args:
+            path: JSON file path (defaults to data/health.json)
+            alpha: EWMA smoothing factor for latency and error rate
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open
+        """
+        self.path = path or data_path('health.json')
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._entries = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'HealthStore':
+        """Create the store from the optional 'health' section of config.json."""
+        health_config = config.get('health', {})
+        return cls(
+            alpha=health_config.get('alpha', DEFAULT_ALPHA),
+            failure_threshold=health_config.get('failure_threshold', DEFAULT_FAILURE_THRESHOLD),
+            cooldown=health_config.get('cooldown_seconds', DEFAULT_COOLDOWN)
+        )
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @property
+    def entries(self) -> dict:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def get(self, provider: str, model: str) -> dict:
+        """Return the health entry for a provider/model (empty if unknown)."""
+        return self.entries.get(f"{provider}:{model}", {})
+
+    def is_available(self, provider: str, model: str) -> bool:
+        """Check whether the provider's circuit is closed or its cool-down is over."""
+        return self.get(provider, model).get('open_until', 0) <= time.time()
+
+    def latency(self, provider: str, model: str) -> Optional[float]:
+        """EWMA latency in seconds, or None if the provider was never used."""
+        return self.get(provider, model).get('ewma_latency')
+
+    def record(self, provider: str, model: str, ok: bool, latency: float):
+        """Record the outcome of one provider call.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            ok: Whether the call succeeded
+            latency: Call duration in seconds
+        """
+        key = f"{provider}:{model}"
+        with _write_lock:
+            # Merge with what other processes wrote since we loaded the file
+            entries = self._read()
+            entry = entries.get(key, {})
+
+            alpha = self.alpha
+            previous = entry.get('ewma_latency')
+            entry['ewma_latency'] = latency if previous is None else alpha * latency + (1 - alpha) * previous
+            entry['error_rate'] = alpha * (0.0 if ok else 1.0) + (1 - alpha) * entry.get('error_rate', 0.0)
+            entry['calls'] = entry.get('calls', 0) + 1
+            entry['updated'] = time.time()
+
+            if ok:
+                entry['consecutive_failures'] = 0
+                entry.pop('open_until', None)
+            else:
+                entry['consecutive_failures'] = entry.get('consecutive_failures', 0) + 1
+                if entry['consecutive_failures'] >= self.failure_threshold:
+                    entry['open_until'] = time.time() + self.cooldown
+
+            entries[key] = entry
+            self._entries = entries
+            try:
+                tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
@@ -0,0 +1,82 @@
+"""Formats for injecting the translated prompt into Claude's context."""
+
+import re
+from typing import Dict
+
+from .selective import NON_ENGLISH_RE
+from .tokens import estimate_tokens
+
+FENCE_BLOCK_RE = re.compile(r'```[\s\S]*?```')
+
+FORMATS = {
+    # Original preamble explaining the translation
+    'full': """[Translation Context]
+The user's message above is in Chinese. Here is the English translation:
+
+{translated}
+
+Please respond based on the translated meaning.""",
+    # One short header line
+    'minimal': "[English translation of the message above]\n{translated}",
+    # Translation only
+    'bare': "{translated}",
+}
+
+DEFAULT_FORMAT = 'full'
+
+
+def code_ratio(prompt: str) -> float:
+    """Share of a prompt that is code or pasted output rather than prose.
+
+    Fenced blocks and lines without any non-English characters (logs, stack
+    traces, diffs pasted after a question) count as code, matching what
+    selective translation sends to the provider.
+
+    Args:
+        prompt: User prompt
+
+    Returns:
+        Fraction between 0 and 1 of non-whitespace characters that are code
+    """
+    total = sum(1 for c in prompt if not c.isspace())
+    if not total:
+        return 0.0
+    code = 0
+    for block in FENCE_BLOCK_RE.findall(prompt):
+        code += sum(1 for c in block if not c.isspace())
+    for line in FENCE_BLOCK_RE.sub('', prompt).split('\n'):
+        if not NON_ENGLISH_RE.search(line):
+            code += sum(1 for c in line if not c.isspace())
+    return code / total
+
+
+def should_skip(prompt: str, injection_config: dict) -> bool:
+    """Check whether a prompt is so code-heavy that injection isn't worth it.
+
+    Args:
+        prompt: User prompt
+        injection_config: The 'injection' section of config.json
+
+    Returns:
+        True if no translation should be injected
+    """
+    threshold = injection_config.get('skip_code_ratio')
+    return threshold is not None and code_ratio(prompt) >= threshold
+
+
+def build_context(translated: str, fmt: str = DEFAULT_FORMAT) -> str:
+    """Render the context text added to Claude's prompt.
+
+    Args:
+        translated: English translation
+        fmt: Format name ('full', 'minimal' or 'bare')
+
+    Returns:
+        Context text
+    """
+    return FORMATS.get(fmt, FORMATS[DEFAULT_FORMAT]).format(translated=translated)
+
+
+def token_report(translated: str) -> Dict[str, int]:
+    """Estimate how many tokens each format adds to Claude's prompt."""
+    return {fmt: estimate_tokens(build_context(translated, fmt)) for fmt in FORMATS}
@@ -0,0 +1,274 @@
+"""Lightweight Markdown segmenter for translating only prose nodes."""
+
+import re
+from typing import List, Tuple, Union
+
+FENCE_RE = re.compile(r'^\s*(```|~~~)')
+HR_RE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+TABLE_SEPARATOR_RE = re.compile(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$')
+QUOTE_RE = re.compile(r'^(\s*(?:>\s?)+)(.*)$')
+HEADING_RE = re.compile(r'^(\s*#{1,6}\s+)(.*?)(\s+#+)?$')
+LIST_RE = re.compile(r'^(\s*(?:[-*+]|\d+[.)])\s+(?:\[[ xX]\]\s+)?)(.*)$')
+CELL_SPLIT_RE = re.compile(r'(?<!\\)\|')
+SETEXT_RE = re.compile(r'^\s*=+\s*$')
+# Two trailing spaces or a backslash end a line with a hard break
+HARD_BREAK_RE = re.compile(r'(?: {2,}|\\)$')
+INDENT_RE = re.compile(r'^[ \t]*')
+
+NUMERIC_RE = re.compile(r'^[\d\s.,:;%+\-–—/×*=#$€¥£()<>~]+$')
+CODE_SPAN_RE = re.compile(r'`[^`]*`')
+URL_RE = re.compile(r'https?://\S+|<[^>\s]+>')
+PATH_RE = re.compile(r'[A-Za-z]:\\[\w\\/.]+|(?:\.{0,2}/)?[\w.-]+(?:/[\w.-]+)+')
+WORD_RE = re.compile(r'[A-Za-z]{2,}')
+CODE_SYMBOLS = set('{}[]();=<>$\\&|')
+CJK_RE = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf]')
+LATIN_RE = re.compile(r'[A-Za-z]')
+
+# A document is a list of literal strings and node indexes into the prose list
+Template = List[Union[str, int]]
+
+
+def is_translatable(text: str) -> bool:
+    """Decide whether a prose node is worth sending to the provider.
+
+    Nodes that are numeric, code-like or already mostly Chinese are skipped.
+
+    Args:
+        text: Node text without surrounding whitespace
+
+    Returns:
+        True if the node should be translated
+    """
+    if not text or NUMERIC_RE.match(text):
+        return False
+
+    # Nothing left but inline code, URLs and paths
+    prose = PATH_RE.sub('', URL_RE.sub('', CODE_SPAN_RE.sub('', text)))
+    if not WORD_RE.search(prose) and not CJK_RE.search(prose):
+        return False
+
+    # Dense punctuation typical of source code
+    visible = [c for c in prose if not c.isspace()]
+    if visible and sum(1 for c in visible if c in CODE_SYMBOLS) > len(visible) * 0.25:
+        return False
+
+    # Already Chinese
+    cjk = len(CJK_RE.findall(text))
+    latin = len(LATIN_RE.findall(text))
+    if cjk and cjk > (cjk + latin) * 0.3:
+        return False
+
+    return True
+
+
+class _Builder:
+    """Accumulates template parts and prose nodes while parsing."""
+
+    def __init__(self):
+        self.template: Template = []
+        self.nodes: List[str] = []
+        # (lead, text, ending) lines of the open paragraph, and its quote depth
+        self.paragraph: List[Tuple[str, str, str]] = []
+        self.paragraph_depth = 0
+
+    def literal(self, text: str):
+        if not text:
+            return
+        if self.template and isinstance(self.template[-1], str):
+            self.template[-1] += text
+        else:
+            self.template.append(text)
+
+    def prose(self, text: str):
+        """Add text as a node, keeping surrounding whitespace literal."""
+        stripped = text.strip()
+        if not is_translatable(stripped):
+            self.literal(text)
+            return
+        start = text.index(stripped)
+        self.literal(text[:start])
+        self.template.append(len(self.nodes))
+        self.nodes.append(stripped)
+        self.literal(text[start + len(stripped):])
+
+    def paragraph_line(self, lead: str, text: str, ending: str, depth: int):
+        """Add a line to the open paragraph, starting a new one if the quote depth changes."""
+        if self.paragraph and depth != self.paragraph_depth:
+            self.flush()
+        hard_break = HARD_BREAK_RE.search(text)
+        if hard_break:
+            # Keep the break marker literal and the next line a separate node
+            text, ending = text[:hard_break.start()], hard_break.group() + ending
+        self.paragraph.append((lead, text, ending))
+        self.paragraph_depth = depth
+        if hard_break:
+            self.flush()
+
+    def flush(self):
+        """Close the open paragraph.
+
+        A hard-wrapped paragraph becomes a single node with its lines joined
+        by spaces, so sentences are not translated in fragments. The
+        translation is then one line.
+        """
+        lines, self.paragraph = self.paragraph, []
+        if not lines:
+            return
+        joined = ' '.join(text.strip() for _, text, _ in lines)
+        if len(lines) == 1 or not is_translatable(joined):
+            for lead, text, ending in lines:
+                self.literal(lead)
+                self.prose(text)
+                self.literal(ending)
+            return
+        lead, first, _ = lines[0]
+        _, last, ending = lines[-1]
+        self.literal(lead + first[:len(first) - len(first.lstrip())])
+        self.template.append(len(self.nodes))
+        self.nodes.append(joined)
+        self.literal(last[len(last.rstrip()):] + ending)
+
+
+def _split_line_ending(line: str) -> Tuple[str, str]:
+    body = line.rstrip('\r\n')
+    return body, line[len(body):]
+
+
+def _indent(body: str) -> int:
+    return len(INDENT_RE.match(body).group().expandtabs(4))
+
+
+def _add_table_row(builder: _Builder, body: str):
+    parts = CELL_SPLIT_RE.split(body)
+    for i, cell in enumerate(parts):
+        if i:
+            builder.literal('|')
+        builder.prose(cell)
+
+
+def _add_block_line(builder: _Builder, body: str, ending: str):
+    """Add a non-table, non-code line, splitting off Markdown markers."""
+    quote = ''
+    match = QUOTE_RE.match(body)
+    if match:
+        quote, body = match.group(1), match.group(2)
+    depth = quote.count('>')
+
+    heading = HEADING_RE.match(body)
+    if heading:
+        builder.flush()
+        builder.literal(quote + heading.group(1))
+        builder.prose(heading.group(2))
+        builder.literal((heading.group(3) or '') + ending)
+        return
+
+    if not body.strip():
+        # An empty quote line separates quoted paragraphs
+        builder.flush()
+        builder.literal(quote + body + ending)
+        return
+
+    item = LIST_RE.match(body)
+    if item:
+        builder.flush()
+        builder.paragraph_line(quote + item.group(1), item.group(2), ending, depth)
+        return
+
+    builder.paragraph_line(quote, body, ending, depth)
+
+
+def segment(text: str) -> Tuple[Template, List[str]]:
+    """Split Markdown into literal structure and translatable prose nodes.
+
+    Fenced and indented code, horizontal rules, table separators and Markdown
+    markers stay literal. Headings, table cells, list items and paragraphs
+    (including quoted ones) become prose nodes, so the structure can be
+    rebuilt exactly; consecutive lines of a paragraph or list item form one
+    node up to a hard line break. Pipe tables are recognized by their
+    separator row, with or without leading pipes.
+
+    Args:
+        text: Markdown text
+
+    Returns:
+        Tuple of (template, prose nodes)
+    """
+    builder = _Builder()
+    fence = None
+    # Indentation of the open indented code block, if any
+    code_indent = None
+    # Content column of the enclosing list item; its paragraphs are indented too
+    list_indent = 0
+
+    # Inside a pipe table (a header row followed by a separator row)
+    in_table = False
+
+    lines = text.splitlines(keepends=True)
+    for index, line in enumerate(lines):
+        body, ending = _split_line_ending(line)
+
+        fence_match = FENCE_RE.match(body)
+        if fence is not None:
+            builder.literal(line)
+            if fence_match and fence_match.group(1) == fence:
+                fence = None
+            continue
+        if fence_match:
+            builder.flush()
+            fence = fence_match.group(1)
+            builder.literal(line)
+            continue
+
+        if not body.strip():
+            builder.flush()
+            builder.literal(line)
+            in_table = False
+            continue
+
+        indent = _indent(body)
+        if code_indent is not None and indent >= code_indent:
+            builder.literal(line)
+            continue
+        code_indent = None
+        if not builder.paragraph:
+            # Indented code cannot interrupt a paragraph
+            if indent >= list_indent + 4:
+                code_indent = list_indent + 4
+                builder.literal(line)
+                continue
+            if indent < list_indent:
+                list_indent = 0
+
+        item = LIST_RE.match(body)
+        if item:
+            list_indent = len(item.group(1).expandtabs(4))
+
+        if not in_table and '|' in body and index + 1 < len(lines):
+            following = _split_line_ending(lines[index + 1])[0]
+            in_table = '|' in following and bool(TABLE_SEPARATOR_RE.match(following))
+
+        if HR_RE.match(body) or SETEXT_RE.match(body) or TABLE_SEPARATOR_RE.match(body):
+            builder.flush()
+            builder.literal(line)
+        elif (in_table and '|' in body) or body.lstrip().startswith('|'):
+            builder.flush()
+            _add_table_row(builder, body)
+            builder.literal(ending)
+        else:
+            _add_block_line(builder, body, ending)
+
+    builder.flush()
+    return builder.template, builder.nodes
+
+
+def rebuild(template: Template, translations: List[str]) -> str:
+    """Rebuild a document from its template and translated nodes.
+
+    Args:
+        template: Template returned by segment()
+        translations: Translated nodes, in the same order as the prose nodes
+
+    Returns:
+        The translated document
+    """
+    return ''.join(part if isinstance(part, str) else translations[part] for part in template)
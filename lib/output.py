@@ -0,0 +1,55 @@
+"""Translation of Claude's answers, shared by the Stop and Notification hooks."""
+
+from typing import List, Optional, Tuple
+
+from .alignment import AlignmentStore
+from .phrasebook import Phrasebook
+from .providers import get_translation_client
+from .shared_cache import open_cache
+from .translation import BLOCK_SEPARATOR, translate_blocks
+
+
+def is_mostly_chinese(text: str) -> bool:
+    """Check whether a message is already primarily Chinese."""
+    chinese_char_count = sum(1 for c in text if '\u4e00' <= c <= '\u9fff')
+    return chinese_char_count > len(text) * 0.3
+
+
+def translate_output_blocks(config: dict, blocks: List[str], deadline=None) -> Tuple[str, Optional[dict], str, int]:
+    """Translate an assistant message to Chinese block by block.
+
+    Args:
+        config: Configuration dictionary
+        blocks: Text blocks of the message
+        deadline: Optional Deadline
+
+    Returns:
+        Tuple of (translated text, usage, outcome, cache hits) where outcome
+        is 'translated', 'cached', 'partial' or 'passthrough'
+    """
+    client = get_translation_client(config)
+    cache = open_cache(config)
+    phrasebook = Phrasebook.load() if config.get('phrasebook', True) else None
+    result = translate_blocks(
+        client, blocks, 'Chinese', cache,
+        markdown_aware=config.get('markdown_output', True),
+        deadline=deadline,
+        phrasebook=phrasebook
+    )
+    translated = BLOCK_SEPARATOR.join(result.blocks)
+
+    # Remember which English sentence each Chinese sentence came from, so
+    # quoting the translation in a later prompt needs no translation
+    if config.get('alignment', True):
+        try:
+            AlignmentStore().add(blocks, result.blocks)
+        except Exception:
+            pass
+
+    if result.complete:
+        outcome = 'cached' if result.cache_hits == len(blocks) else 'translated'
+    elif translated != BLOCK_SEPARATOR.join(blocks):
+        outcome = 'partial'
+    else:
+        outcome = 'passthrough'
+    return translated, result.usage, outcome, result.cache_hits
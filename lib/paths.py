@@ -0,0 +1,30 @@
+"""Filesystem locations used by the translation hooks."""
+
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Environment overrides, used e.g. by the load-test harness to isolate runs
+CONFIG_ENV = 'CLAUDE_TRANSLATOR_CONFIG'
+DATA_DIR_ENV = 'CLAUDE_TRANSLATOR_DATA_DIR'
+HEADLESS_ENV = 'CLAUDE_TRANSLATOR_HEADLESS'
+
+
+def config_path() -> str:
+    """Path of config.json, overridable with CLAUDE_TRANSLATOR_CONFIG."""
+    return os.environ.get(CONFIG_ENV) or os.path.join(PROJECT_ROOT, 'config.json')
+
+
+def data_path(*parts: str) -> str:
+    """Return a path inside the plugin's data directory, creating it if needed.
+
+    Args:
+        *parts: Path components relative to the data directory
+
+    Returns:
+        Absolute path to the requested file or directory
+    """
+    data_dir = os.environ.get(DATA_DIR_ENV) or os.path.join(PROJECT_ROOT, 'data')
+    path = os.path.join(data_dir, *parts)
+    os.makedirs(os.path.dirname(path) if parts else path, exist_ok=True)
+    return path
@@ -0,0 +1,264 @@
+"""Offline phrasebook for recurring Claude Code phrases.
+
+Phrases live in phrasebook.json at the project root, grouped by target
+language. Entries may contain {slot} placeholders whose values (a file name,
+a command, a number, ...) are copied into the translation unchanged; a slot
+matches a single English token or a `code span`, and {{ and }} stand for
+literal braces. The source file is
+compiled into data/phrasebook.compiled-v2.json: exact phrases become a hash map
+and templates a character trie over their literal prefix, so a lookup costs
+one dict access or one short trie walk.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+from .paths import PROJECT_ROOT, data_path
+from .selective import NON_ENGLISH_RE
+
+SOURCE_PATH = os.path.join(PROJECT_ROOT, 'phrasebook.json')
+# Versioned so files compiled with older slot patterns are not reused
+COMPILED_NAME = 'phrasebook.compiled-v2.json'
+# {name} is a slot, {{ and }} are escaped braces
+SLOT_RE = re.compile(r'\{\{|\}\}|\{(\w*)\}')
+# A slot value is one token or one inline code span, never running prose
+SLOT_VALUE = r'`[^`\n]+`|[^\s`]+?'
+
+# Key of the template ids stored on a trie node
+TRIE_END = '$'
+
+
+def normalize_phrase(text: str) -> str:
+    """Normalize a phrase for lookup (collapsed whitespace, lower case)."""
+    return ' '.join(text.split()).lower()
+
+
+def escape_phrase(text: str) -> str:
+    """Escape braces so a text is taken literally, without slots."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def _slot_names(source: str) -> List[str]:
+    return [match.group(1) for match in SLOT_RE.finditer(source) if match.group(1) is not None]
+
+
+def _fill(target: str, values: Dict[str, str]) -> str:
+    """Put slot values into a target and unescape its braces."""
+    def replace(match):
+        if match.group(1) is None:
+            return match.group(0)[0]
+        return values.get(match.group(1).lower(), match.group(0))
+    return SLOT_RE.sub(replace, target)
+
+
+def validate_source(source: str) -> Optional[str]:
+    """Check the slots of a phrase source.
+
+    Returns:
+        Description of the problem, or None if the source is valid
+    """
+    names = [name.lower() for name in _slot_names(source)]
+    for name in names:
+        if not name.isidentifier():
+            return f"invalid slot name {{{name}}} (use letters, digits and _, not starting with a digit)"
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        return f"slot {{{duplicates[0]}}} is used more than once"
+    return None
+
+
+def _template_regex(source: str) -> str:
+    """Regex fully matching a normalized template source."""
+    parts = []
+    last = 0
+    for match in SLOT_RE.finditer(source):
+        parts.append(re.escape(source[last:match.start()]))
+        if match.group(1) is None:
+            parts.append(re.escape(match.group(0)[0]))
+        else:
+            parts.append(f'(?P<{match.group(1)}>{SLOT_VALUE})')
+        last = match.end()
+    parts.append(re.escape(source[last:]))
+    return ''.join(parts)
+
+
+def compile_phrasebook(phrases: Dict[str, List[dict]]) -> dict:
+    """Compile phrasebook source entries into lookup structures.
+
+    Args:
+        phrases: Mapping of target language to [{"source", "target"}] entries
+
+    Returns:
+        JSON-serializable compiled phrasebook
+    """
+    compiled = {}
+    for target_lang, entries in phrases.items():
+        exact = {}
+        templates = []
+        trie = {}
+        for entry in entries:
+            source = normalize_phrase(entry['source'])
+            if validate_source(source):
+                # Rejected by tools/phrasebook.py; skipped so one bad entry
+                # doesn't break the whole phrasebook
+                continue
+            slots = [match for match in SLOT_RE.finditer(source) if match.group(1) is not None]
+            if not slots:
+                exact[_fill(source, {})] = _fill(entry['target'], {})
+                continue
+            template_id = len(templates)
+            templates.append({'pattern': _template_regex(source), 'target': entry['target']})
+            # Index the template under the literal text before its first slot
+            node = trie
+            for char in _fill(source[:slots[0].start()], {}):
+                node = node.setdefault(char, {})
+            node.setdefault(TRIE_END, []).append(template_id)
+        compiled[target_lang.lower()] = {'exact': exact, 'templates': templates, 'trie': trie}
+    return compiled
+
+
+class Phrasebook:
+    """Local translations for exact and templated phrases."""
+
+    def __init__(self, compiled: dict):
+        """Initialize the phrasebook.
+
+        Args:
+            compiled: Output of compile_phrasebook()
+        """
+        self.compiled = compiled
+        self._patterns = {
+            lang: [re.compile(t['pattern'], re.DOTALL) for t in table['templates']]
+            for lang, table in compiled.items()
+        }
+
+    @classmethod
+    def load(cls, source_path: str = SOURCE_PATH, compiled_path: Optional[str] = None) -> 'Phrasebook':
+        """Load the compiled phrasebook, rebuilding it if the source is newer.
+
+        Args:
+            source_path: Phrasebook source JSON
+            compiled_path: Compiled phrasebook (defaults to data/phrasebook.compiled-v2.json)
+
+        Returns:
+            Phrasebook instance (empty if there is no source or it cannot be compiled)
+        """
+        compiled_path = compiled_path or data_path(COMPILED_NAME)
+        try:
+            if os.path.getmtime(compiled_path) >= os.path.getmtime(source_path):
+                with open(compiled_path, 'r', encoding='utf-8') as f:
+                    return cls(json.load(f))
+        except (OSError, ValueError, KeyError, re.error):
+            pass
+        try:
+            return cls(build(source_path, compiled_path))
+        except (OSError, ValueError, KeyError, TypeError, re.error):
+            # A broken phrasebook must not turn translation off
+            return cls({})
+
+    def lookup(self, text: str, target_lang: str, templates: bool = True) -> Optional[str]:
+        """Translate a phrase locally.
+
+        Args:
+            text: Phrase to translate
+            target_lang: Target language ('English' or 'Chinese')
+            templates: Also try {slot} templates, not only exact phrases
+
+        Returns:
+            Translation, or None if the phrase is not in the phrasebook
+        """
+        table = self.compiled.get(target_lang.lower())
+        if not table:
+            return None
+
+        normalized = normalize_phrase(text)
+        if normalized in table['exact']:
+            return table['exact'][normalized]
+        if not templates:
+            return None
+
+        # Walk the trie along the text; deeper prefixes are more specific
+        candidates = []
+        node = table['trie']
+        candidates.extend(node.get(TRIE_END, []))
+        for char in normalized:
+            node = node.get(char)
+            if node is None:
+                break
+            candidates.extend(node.get(TRIE_END, []))
+
+        # Slot values come from the original text so their case is kept
+        original = ' '.join(text.split())
+        patterns = self._patterns[target_lang.lower()]
+        for template_id in reversed(candidates):
+            match = patterns[template_id].fullmatch(normalized)
+            if not match:
+                continue
+            values = {}
+            for name in match.groupdict():
+                values[name] = original[match.start(name):match.end(name)]
+            # Untranslated text must not pass as a file name or command
+            if any(NON_ENGLISH_RE.search(value) for value in values.values()):
+                continue
+            return _fill(table['templates'][template_id]['target'], values)
+        return None
+
+    def lookup_lines(self, text: str, target_lang: str, templates: bool = True) -> Optional[str]:
+        """Translate a text locally if every non-blank line is a known phrase.
+
+        Args:
+            text: Text to translate
+            target_lang: Target language ('English' or 'Chinese')
+            templates: Also try {slot} templates, not only exact phrases
+
+        Returns:
+            Translation with blank lines kept, or None if any line is unknown
+        """
+        lines = text.strip().split('\n')
+        translated = []
+        for line in lines:
+            if not line.strip():
+                translated.append(line)
+                continue
+            hit = self.lookup(line, target_lang, templates)
+            if hit is None:
+                return None
+            translated.append(hit)
+        return '\n'.join(translated)
+
+
+def load_phrases(source_path: str = SOURCE_PATH) -> Dict[str, List[dict]]:
+    """Read the phrasebook source file (empty if it does not exist)."""
+    try:
+        with open(source_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_phrases(phrases: Dict[str, List[dict]], source_path: str = SOURCE_PATH):
+    """Write the phrasebook source file."""
+    with open(source_path, 'w', encoding='utf-8') as f:
+        json.dump(phrases, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def build(source_path: str = SOURCE_PATH, compiled_path: Optional[str] = None) -> dict:
+    """Compile the phrasebook source and write the compiled file.
+
+    Args:
+        source_path: Phrasebook source JSON
+        compiled_path: Output path (defaults to data/phrasebook.compiled-v2.json)
+
+    Returns:
+        The compiled phrasebook
+    """
+    compiled = compile_phrasebook(load_phrases(source_path))
+    compiled_path = compiled_path or data_path(COMPILED_NAME)
+    tmp_path = f"{compiled_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(compiled, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, compiled_path)
+    return compiled
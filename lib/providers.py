@@ -0,0 +1,161 @@
+"""Provider selection with health-based routing and failover."""
+
+import time
+from typing import List, Optional
+
+from .baidu_client import DEFAULT_BASE_URL, DEFAULT_MAX_BYTES, DEFAULT_QPS, BaiduClient
+from .deadline import DeadlineExceeded
+from .health import HealthStore
+from .qianwen_client import QianwenClient
+from .transport import get_transport
+
+
+def create_client(provider: str, config: dict):
+    """Create the client for a single provider.
+
+    Args:
+        provider: Provider name ('qianwen' or 'baidu')
+        config: Configuration dictionary
+
+    Returns:
+        Translation client instance
+    """
+    transport = get_transport(config.get('transport'))
+    if provider == 'baidu':
+        baidu_config = config['baidu']
+        return BaiduClient(
+            api_key=baidu_config['api_key'],
+            app_id=baidu_config['app_id'],
+            max_bytes=baidu_config.get('max_bytes', DEFAULT_MAX_BYTES),
+            qps=baidu_config.get('qps', DEFAULT_QPS),
+            base_url=baidu_config.get('base_url', DEFAULT_BASE_URL),
+            transport=transport
+        )
+    else:
+        # Default to qianwen
+        qianwen_config = config['qianwen']
+        return QianwenClient(
+            base_url=qianwen_config['base_url'],
+            api_key=qianwen_config['api_key'],
+            model=qianwen_config['model'],
+            tiers=qianwen_config.get('tiers'),
+            transport=transport
+        )
+
+
+class MonitoredClient:
+    """Translation client that records provider health and fails over.
+
+    Calls go to the first provider whose circuit is closed. A failed call is
+    retried on the next available provider. Everything else is delegated to
+    the configured primary client, whatever the current routing order.
+    """
+
+    def __init__(self, clients: List, health: HealthStore, order: Optional[List] = None):
+        """Initialize the client.
+
+        Args:
+            clients: Provider clients in configured order, primary first
+            health: Health store updated by every call
+            order: The same clients in routing order (defaults to the configured order)
+        """
+        self.primary = clients[0]
+        self.clients = order or clients
+        self.health = health
+        # Cache keys name the configured provider chain: any provider in it may
+        # have produced a translation, and keys must not change with routing
+        self.provider = '+'.join(c.provider for c in clients)
+
+    def __getattr__(self, name):
+        return getattr(self.primary, name)
+
+    @staticmethod
+    def _model(client, text: str, target_lang: str) -> str:
+        """Model the client routes this request to, for per-model health."""
+        model_for = getattr(client, 'model_for', None)
+        return model_for(text, target_lang) if model_for else client.model
+
+    def _available(self, text: str, target_lang: str) -> List:
+        return [c for c in self.clients
+                if self.health.is_available(c.provider, self._model(c, text, target_lang))] or self.clients[:1]
+
+    def _call(self, method: str, payload, target_lang: str, deadline=None):
+        # Batches are routed on their combined text
+        text = payload if isinstance(payload, str) else '\n'.join(payload)
+        last_error = None
+        for client in self._available(text, target_lang):
+            model = self._model(client, text, target_lang)
+            started = time.monotonic()
+            try:
+                result = getattr(client, method)(payload, target_lang, deadline=deadline)
+            except DeadlineExceeded:
+                # Our own time budget ran out, not the provider's fault
+                raise
+            except Exception as e:
+                self.health.record(client.provider, model, False, time.monotonic() - started)
+                last_error = e
+                continue
+            self.health.record(client.provider, model, True, time.monotonic() - started)
+            return result
+        raise last_error
+
+    def translate(self, text: str, target_lang: str, deadline=None):
+        """Translate text with the healthiest available provider."""
+        return self._call('translate', text, target_lang, deadline=deadline)
+
+    def translate_batch(self, texts: list, target_lang: str, deadline=None):
+        """Translate segments with the healthiest available provider."""
+        return self._call('translate_batch', texts, target_lang, deadline=deadline)
+
+    def translate_stream(self, text: str, target_lang: str, deadline=None):
+        """Stream a translation from the healthiest available provider.
+
+        Failover only happens while nothing has been yielded yet.
+        """
+        last_error = None
+        for client in self._available(text, target_lang):
+            model = self._model(client, text, target_lang)
+            started = time.monotonic()
+            yielded = False
+            try:
+                for piece in client.translate_stream(text, target_lang, deadline=deadline):
+                    yielded = True
+                    yield piece
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                self.health.record(client.provider, model, False, time.monotonic() - started)
+                if yielded:
+                    raise
+                last_error = e
+                continue
+            self.health.record(client.provider, model, True, time.monotonic() - started)
+            return
+        raise last_error
+
+
+def get_translation_client(config):
+    """Get the appropriate translation client based on config.
+
+    The configured provider comes first, followed by 'fallback_providers'.
+    With "routing": "latency", available providers are ordered by their
+    EWMA latency instead. Providers with an open circuit go last.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        Translation client instance
+    """
+    primary = config.get('provider', 'qianwen')
+    names = [primary] + [p for p in config.get('fallback_providers', []) if p != primary]
+    clients = [create_client(name, config) for name in names]
+
+    health = HealthStore.from_config(config)
+    order = list(clients)
+    if config.get('routing') == 'latency':
+        # Unknown providers sort first so they get measured
+        order.sort(key=lambda c: health.latency(c.provider, c.model) or 0.0)
+    order.sort(key=lambda c: not health.is_available(c.provider, c.model))
+
+    return MonitoredClient(clients, health, order)
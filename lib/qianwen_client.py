@@ -1,24 +1,37 @@
 """Qianwen API client for translation using OpenAI-compatible API."""
 
 import re
-import requests
+import time
 import json
 
+from . import stats
+from .deadline import DeadlineExceeded, check, request_timeout
+from .tiering import parse_tiers, select_tier
+from .transport import TransportError, get_transport
+
+SEGMENT_RE = re.compile(r'^\[(\d+)\]\s?(.*)$')
+
 
 class QianwenClient:
     """Client for Qianwen API translation services."""
 
-    def __init__(self, base_url: str, api_key: str, model: str):
+    provider = 'qianwen'
+
+    def __init__(self, base_url: str, api_key: str, model: str, tiers: list = None, transport=None):
         """Initialize the Qianwen client.
 
         Args:
             base_url: API base URL
             api_key: API authentication key
-            model: Model name to use for translation
+            model: Default model name to use for translation
+            tiers: Optional list of tier configs routing requests by size and direction
+            transport: HTTP transport (see lib/transport.py), the default one if None
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.model = model
+        self.tiers = parse_tiers(tiers)
+        self.transport = transport or get_transport()
 
     def detect_chinese(self, text: str) -> bool:
         """Check if text contains Chinese characters.
@@ -78,16 +91,34 @@ class QianwenClient:
         # (more than 2 characters to avoid false positives from symbols)
         return len(matches) > 2
 
-    def translate(self, text: str, target_lang: str) -> str:
+    def translate(self, text: str, target_lang: str, deadline=None) -> str:
         """Translate text to target language using Qianwen API.
 
         Args:
             text: Text to translate
             target_lang: Target language ('English' or 'Chinese')
+            deadline: Optional Deadline capping the request timeout
 
         Returns:
             Translated text
 
+        Raises:
+            Exception: If API call fails
+        """
+        content, usage = self._chat(self._translate_prompt(target_lang), text, target_lang, deadline)
+        return content.strip(), usage
+
+    def translate_stream(self, text: str, target_lang: str, deadline=None):
+        """Translate text, yielding the translation as it is generated.
+
+        Args:
+            text: Text to translate
+            target_lang: Target language ('English' or 'Chinese')
+            deadline: Optional Deadline; streaming stops once it passes
+
+        Yields:
+            Pieces of the translated text, in order
+
         Raises:
             Exception: If API call fails
         """
@@ -98,30 +129,178 @@ class QianwenClient:
             "Content-Type": "application/json"
         }
 
-        system_prompt = f"""You are a professional translator. Translate the following text to {target_lang}.
+        payload = self._payload(self._translate_prompt(target_lang), text, target_lang)
+        payload["stream"] = True
+
+        try:
+            response = self.transport.post_json(url, payload, headers=headers,
+                                                timeout=request_timeout(deadline), stream=True)
+
+            with response:
+                for line in response.iter_lines():
+                    check(deadline)
+                    if not line or not line.startswith('data:'):
+                        continue
+                    data = line[len('data:'):].strip()
+                    if data == '[DONE]':
+                        break
+                    choices = json.loads(data).get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        yield delta
+                    if choices and choices[0].get("finish_reason") == 'length':
+                        raise Exception("Translation API error: output truncated at the length limit")
+        except TransportError as e:
+            if deadline and deadline.expired():
+                raise DeadlineExceeded(f"Translation API timed out: {e}")
+            raise Exception(f"Translation API error: {e}")
+        except (KeyError, IndexError, ValueError) as e:
+            raise Exception(f"Invalid API response format: {e}")
+
+    def translate_batch(self, texts: list, target_lang: str, deadline=None) -> tuple:
+        """Translate several single-line segments in one request.
+
+        Segments are sent as numbered lines and matched back by number.
+        Segments missing from the response are translated individually.
+
+        Args:
+            texts: Single-line texts to translate
+            target_lang: Target language ('English' or 'Chinese')
+            deadline: Optional Deadline capping every request timeout
+
+        Returns:
+            Tuple of (list of translated texts in input order, usage dict)
+
+        Raises:
+            Exception: If API call fails
+        """
+        system_prompt = f"""You are a professional translator. Translate each numbered segment to {target_lang}.
+Rules:
+1. Output one line per segment in the form [n] translation, keeping every number
+2. Only output the translated segments, no explanations
+3. Preserve inline code, Markdown markup, file paths, URLs and technical terms as-is
+4. If a segment is already in {target_lang}, return it unchanged"""
+
+        numbered = "\n".join(f"[{i}] {text}" for i, text in enumerate(texts, 1))
+        content, usage = self._chat(system_prompt, numbered, target_lang, deadline)
+
+        translated = {}
+        for line in content.splitlines():
+            match = SEGMENT_RE.match(line.strip())
+            if match:
+                translated[int(match.group(1))] = match.group(2).strip()
+
+        results = []
+        for i, text in enumerate(texts, 1):
+            if translated.get(i):
+                results.append(translated[i])
+            else:
+                single, single_usage = self.translate(text, target_lang, deadline)
+                results.append(single)
+                for name, value in (single_usage or {}).items():
+                    if isinstance(value, (int, float)):
+                        usage[name] = usage.get(name, 0) + value
+        return results, usage
+
+    @staticmethod
+    def _translate_prompt(target_lang: str) -> str:
+        """System prompt for translating a whole text."""
+        return f"""You are a professional translator. Translate the following text to {target_lang}.
 Rules:
 1. Only output the translated text, no explanations
 2. Preserve code blocks, file paths, and technical terms as-is
 3. Maintain the original formatting and structure
 4. If the text is already in {target_lang}, return it unchanged"""
 
+    def model_for(self, text: str, target_lang: str) -> str:
+        """Model the tier policy routes a request for this text to."""
+        tier = select_tier(self.tiers, text, target_lang)
+        return tier.model if tier else self.model
+
+    def _payload(self, system_prompt: str, text: str, target_lang: str) -> dict:
+        """Build the chat completion payload, routed through the tier policy."""
+        tier = select_tier(self.tiers, text, target_lang)
+
         payload = {
-            "model": self.model,
+            "model": self.model_for(text, target_lang),
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": text}
             ],
-            "temperature": 0.3
+            "temperature": tier.temperature if tier else 0.3
         }
+        if tier:
+            payload["max_tokens"] = tier.max_tokens(text, target_lang)
+        return payload
+
+    def _post(self, url: str, payload: dict, headers: dict, deadline=None) -> tuple:
+        """Send one chat completion request.
+
+        Returns:
+            Tuple of (response content, usage dict, finish reason)
 
+        Raises:
+            Exception: If API call fails
+        """
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            response.raise_for_status()
+            response = self.transport.post_json(url, payload, headers=headers,
+                                                timeout=request_timeout(deadline))
 
             result = response.json()
             usage = result.get("usage", {})
-            return result["choices"][0]["message"]["content"].strip(), usage
-        except requests.exceptions.RequestException as e:
+            choice = result["choices"][0]
+            return choice["message"]["content"], usage, choice.get("finish_reason")
+        except TransportError as e:
+            if deadline and deadline.expired():
+                raise DeadlineExceeded(f"Translation API timed out: {e}")
             raise Exception(f"Translation API error: {e}")
-        except (KeyError, IndexError) as e:
+        except (KeyError, IndexError, ValueError) as e:
             raise Exception(f"Invalid API response format: {e}")
+
+    def _chat(self, system_prompt: str, text: str, target_lang: str, deadline=None) -> tuple:
+        """Send one chat completion request, routed through the tier policy.
+
+        Args:
+            system_prompt: System prompt with the translation instructions
+            text: User message to translate
+            target_lang: Target language ('English' or 'Chinese')
+            deadline: Optional Deadline capping the request timeout
+
+        A response cut off by the tier's max_tokens is requested again
+        without the bound; one cut off by the model's own limit is an error,
+        never returned as a complete translation.
+
+        Returns:
+            Tuple of (response content, usage dict)
+
+        Raises:
+            Exception: If API call fails
+        """
+        url = f"{self.base_url}/chat/completions"
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        payload = self._payload(system_prompt, text, target_lang)
+
+        started = time.monotonic()
+        content, usage, finish_reason = self._post(url, payload, headers, deadline)
+        if finish_reason == 'length' and 'max_tokens' in payload:
+            # The tier's output bound cut the translation off; retry without it
+            del payload['max_tokens']
+            content, retry_usage, finish_reason = self._post(url, payload, headers, deadline)
+            for name, value in retry_usage.items():
+                if isinstance(value, (int, float)):
+                    usage[name] = usage.get(name, 0) + value
+        if finish_reason == 'length':
+            raise Exception("Translation API error: output truncated at the model's length limit")
+
+        if self.tiers:
+            tier = select_tier(self.tiers, text, target_lang)
+            stats.record('tier', model=payload["model"], tier=self.tiers.index(tier) if tier else None,
+                         target=target_lang, chars=len(text), max_tokens=payload.get("max_tokens"),
+                         finish_reason=finish_reason,
+                         latency=round(time.monotonic() - started, 3), usage=usage)
+        return content, usage
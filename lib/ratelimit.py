@@ -0,0 +1,40 @@
+"""Thread-safe request rate limiting."""
+
+import threading
+import time
+
+from .deadline import DeadlineExceeded
+
+
+class RateLimiter:
+    """Spaces out calls so that at most `qps` start per second."""
+
+    def __init__(self, qps: float):
+        """Initialize the limiter.
+
+        Args:
+            qps: Allowed calls per second (0 or None for no limit)
+        """
+        self.interval = 1.0 / qps if qps else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        """Block until the caller may start its request.
+
+        Args:
+            deadline: Optional Deadline; waiting past it raises
+
+        Raises:
+            DeadlineExceeded: If the slot starts after the deadline
+        """
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            remaining = deadline.remaining() if deadline else None
+            if remaining is not None and start - now >= remaining:
+                raise DeadlineExceeded("Rate limit wait exceeds the time budget")
+            self._next = start + self.interval
+        time.sleep(max(0.0, start - now))
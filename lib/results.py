@@ -0,0 +1,100 @@
+"""Store for output translations prepared ahead of the Notification hook."""
+
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+from .paths import data_path
+
+# Results older than this are removed when new ones are written
+MAX_AGE = 24 * 3600
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def result_key(transcript_path: str, message_id: Optional[str], text: str) -> str:
+    """Key identifying one assistant message of one transcript.
+
+    Args:
+        transcript_path: Path of the session transcript
+        message_id: Assistant message id (None if the transcript has none)
+        text: Message text, used when there is no id
+
+    Returns:
+        Hex key
+    """
+    ident = message_id or hashlib.sha256(text.encode('utf-8')).hexdigest()
+    raw = f"{os.path.abspath(transcript_path)}\0{ident}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+class ResultStore:
+    """One JSON file per message in data/results/."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.dirname(data_path('results', 'x'))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[dict]:
+        """Read a result, or None if there is none."""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key: str, status: str, **fields):
+        """Atomically write a result and prune old ones.
+
+        Args:
+            key: Result key
+            status: PENDING, DONE or FAILED
+            **fields: JSON-serializable result fields
+        """
+        entry = {"status": status, "updated": time.time()}
+        entry.update(fields)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._prune()
+
+    def wait(self, key: str, timeout: Optional[float], interval: float = 0.1) -> Optional[dict]:
+        """Wait until a pending result is done or failed.
+
+        Args:
+            key: Result key
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            interval: Polling interval in seconds
+
+        Returns:
+            The finished result, or None if there is none, it is still
+            pending, or the worker preparing it is past its 'expires' time
+        """
+        give_up = None if timeout is None else time.monotonic() + timeout
+        while True:
+            result = self.load(key)
+            if result is None or result['status'] != PENDING:
+                return result
+            if time.time() >= result.get('expires', float('inf')):
+                return None
+            if give_up is not None and time.monotonic() >= give_up:
+                return None
+            time.sleep(interval)
+
+    def _prune(self):
+        now = time.time()
+        try:
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if now - os.path.getmtime(path) > MAX_AGE:
+                    os.remove(path)
+        except OSError:
+            pass
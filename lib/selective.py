@@ -0,0 +1,108 @@
+"""Selective translation of prompts mixing prose with pasted logs and code.
+
+A prompt is split into lines. Runs of consecutive lines containing
+non-English text become prose segments that are sent to the provider.
+Everything else, i.e. fenced code blocks, English-only lines such as logs,
+stack traces and diffs, and blank lines, is kept byte for byte. Translation
+cost and latency then depend on the amount of non-English text instead of
+the size of the prompt.
+"""
+
+import re
+from typing import Iterator, List, Optional, Tuple
+
+from .markdown import FENCE_RE
+from .translation import translate_blocks
+
+# Scripts detected by the clients' detect_non_english(); one character is
+# enough to make a line prose
+NON_ENGLISH_RE = re.compile(
+    r'[\u4e00-\u9fff\u3400-\u4dbf\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af'
+    r'\u0400-\u04ff\u0600-\u06ff\u0e00-\u0e7f\u1e00-\u1eff\u0370-\u03ff\u0590-\u05ff\u0900-\u097f\u0980-\u09ff\u0c00-\u0c7f\u0b80-\u0bff]'
+)
+LEADING_SPACE_RE = re.compile(r'^\s*')
+
+# A prompt is a list of (text, is_prose) parts joined with newlines
+Parts = List[Tuple[str, bool]]
+
+
+def split_prompt(prompt: str) -> Parts:
+    """Split a prompt into prose segments and untouched parts.
+
+    Args:
+        prompt: User prompt
+
+    Returns:
+        List of (text, is_prose) parts; '\\n'.join() of the texts gives back
+        the prompt
+    """
+    parts: Parts = []
+    in_fence = False
+    for line in prompt.split('\n'):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+            is_prose = False
+        else:
+            is_prose = not in_fence and bool(NON_ENGLISH_RE.search(line))
+        if parts and parts[-1][1] == is_prose:
+            parts[-1] = (f"{parts[-1][0]}\n{line}", is_prose)
+        else:
+            parts.append((line, is_prose))
+    return parts
+
+
+def prose_chars(parts: Parts) -> int:
+    """Number of characters that need translation."""
+    return sum(len(text) for text, is_prose in parts if is_prose)
+
+
+def translate_prompt(client, prompt: str, cache=None, deadline=None, phrasebook=None,
+                     max_workers: int = 4) -> Tuple[Optional[str], Optional[dict], Parts]:
+    """Translate only the prose segments of a prompt to English.
+
+    Args:
+        client: Translation client
+        prompt: User prompt
+        cache: Optional TranslationCache for the segments
+        deadline: Optional Deadline
+        phrasebook: Optional Phrasebook translating known segments locally
+        max_workers: Maximum number of concurrent provider requests
+
+    Returns:
+        Tuple of (translated prompt, or None if not every segment was
+        translated in time, combined usage, the prompt's parts)
+    """
+    parts = split_prompt(prompt)
+    segments = [text for text, is_prose in parts if is_prose]
+    result = translate_blocks(client, [text.strip() for text in segments], 'English', cache,
+                              max_workers=max_workers, deadline=deadline, phrasebook=phrasebook)
+    if not result.complete:
+        return None, result.usage, parts
+
+    translations = iter(result.blocks)
+    rebuilt = []
+    for text, is_prose in parts:
+        # Keep the indentation the provider strips
+        rebuilt.append(LEADING_SPACE_RE.match(text).group() + next(translations) if is_prose else text)
+    return '\n'.join(rebuilt), result.usage, parts
+
+
+def translate_prompt_stream(client, prompt: str, deadline=None) -> Iterator[str]:
+    """Stream the translation of a prompt, passing non-prose parts through.
+
+    Args:
+        client: Translation client
+        prompt: User prompt
+        deadline: Optional Deadline
+
+    Yields:
+        Pieces of the translated prompt, in order
+    """
+    for i, (text, is_prose) in enumerate(split_prompt(prompt)):
+        if i:
+            yield '\n'
+        if not is_prose:
+            yield text
+            continue
+        yield LEADING_SPACE_RE.match(text).group()
+        yield from client.translate_stream(text.strip(), 'English', deadline=deadline)
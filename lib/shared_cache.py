@@ -0,0 +1,163 @@
+"""Optional shared team cache tier between the local cache and providers."""
+
+import atexit
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from .cache import TranslationCache
+from .transport import get_transport
+
+# Per-request timeout; a slow cache must never hold up the hook
+DEFAULT_TIMEOUT = 0.3
+
+# Cache URLs that failed in this process; they are not contacted again
+_dead_urls = set()
+# Background writes still running, and the lock guarding the set
+_pending_writes = set()
+_pending_lock = threading.Lock()
+
+
+def _finish_writes():
+    """Give background writes at most one timeout to finish at exit."""
+    give_up = time.monotonic() + DEFAULT_TIMEOUT
+    with _pending_lock:
+        threads = list(_pending_writes)
+    for thread in threads:
+        thread.join(max(0.0, give_up - time.monotonic()))
+
+
+atexit.register(_finish_writes)
+
+
+class SharedCacheClient:
+    """Client for the shared cache HTTP service (see tools/cache_server.py).
+
+    Every failure is swallowed: an unreachable or slow cache behaves like
+    an empty one. After the first failure or timeout the cache is not
+    contacted again by this process, and writes never block the caller.
+    """
+
+    def __init__(self, url: str, timeout: float = DEFAULT_TIMEOUT, token: Optional[str] = None,
+                 transport=None):
+        """Initialize the client.
+
+        Args:
+            url: Base URL of the cache service
+            timeout: Timeout in seconds for every request
+            token: Optional bearer token
+            transport: HTTP transport (see lib/transport.py), the default one if None
+        """
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.transport = transport or get_transport()
+        self.headers = {"Content-Type": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Fetch several translations in one request."""
+        keys = list(keys)
+        if not keys or self.dead:
+            return {}
+        try:
+            response = self.transport.post_json(f"{self.url}/mget", {"keys": keys},
+                                                headers=self.headers, timeout=self.timeout)
+            return response.json().get("items", {})
+        except Exception:
+            _dead_urls.add(self.url)
+            return {}
+
+    @property
+    def dead(self) -> bool:
+        """Whether a request to this cache already failed in this process."""
+        return self.url in _dead_urls
+
+    def put_many(self, items: Dict[str, tuple]):
+        """Store several (source, translation) pairs in one background request.
+
+        Writes still running when the process exits get at most one timeout
+        to finish.
+        """
+        if not items or self.dead:
+            return
+        payload = {
+            "items": {key: {"source": source, "translation": translation}
+                      for key, (source, translation) in items.items()}
+        }
+        thread = threading.Thread(target=self._put, args=(payload,), daemon=True)
+        with _pending_lock:
+            _pending_writes.add(thread)
+        thread.start()
+
+    def _put(self, payload: dict):
+        try:
+            self.transport.post_json(f"{self.url}/mput", payload, headers=self.headers, timeout=self.timeout)
+        except Exception:
+            _dead_urls.add(self.url)
+        finally:
+            with _pending_lock:
+                _pending_writes.discard(threading.current_thread())
+
+
+class LayeredCache:
+    """Local cache backed by the shared cache.
+
+    Lookups go to the local cache first and only the misses to the shared
+    cache; shared hits are copied into the local cache. Writes go to both.
+    """
+
+    def __init__(self, local: TranslationCache, shared: SharedCacheClient):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a single translation by key."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Look up several translations, local first."""
+        keys = list(keys)
+        found = self.local.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            shared = self.shared.get_many(missing)
+            if shared:
+                # Source text isn't returned by the shared cache
+                self.local.put_many({key: (None, translation) for key, translation in shared.items()})
+                found.update(shared)
+        return found
+
+    def put(self, key: str, source: str, translation: str):
+        """Store a single translation."""
+        self.put_many({key: (source, translation)})
+
+    def put_many(self, items: Dict[str, tuple]):
+        """Store several translations in both tiers."""
+        self.local.put_many(items)
+        self.shared.put_many(items)
+
+
+def open_cache(config: dict):
+    """Create the translation cache described by config.json.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        None if caching is disabled, a TranslationCache, or a LayeredCache
+        when 'shared_cache.url' is set
+    """
+    if not config.get('cache', True):
+        return None
+    local = TranslationCache()
+    shared_config = config.get('shared_cache') or {}
+    if not shared_config.get('url'):
+        return local
+    shared = SharedCacheClient(
+        url=shared_config['url'],
+        timeout=shared_config.get('timeout', DEFAULT_TIMEOUT),
+        token=shared_config.get('token'),
+        transport=get_transport(config.get('transport'))
+    )
+    return LayeredCache(local, shared)
@@ -0,0 +1,25 @@
+"""Append-only event log used to tune budgets and thresholds."""
+
+import json
+import time
+
+from .paths import data_path
+
+
+def record(event: str, **fields):
+    """Append an event to data/stats.jsonl.
+
+    Recording is best effort: failures are swallowed so that statistics
+    never break a hook.
+
+    Args:
+        event: Event name, e.g. 'input' or 'output'
+        **fields: JSON-serializable event details
+    """
+    entry = {"ts": round(time.time(), 3), "event": event}
+    entry.update(fields)
+    try:
+        with open(data_path('stats.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except Exception:
+        pass
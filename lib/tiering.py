@@ -0,0 +1,79 @@
+"""Size-based model tiering for Qianwen requests."""
+
+from typing import List, Optional
+
+# Bounds applied to the max_tokens derived from the input length
+MIN_MAX_TOKENS = 64
+MAX_MAX_TOKENS = 8192
+# Output tokens per input character when a tier sets no max_tokens_ratio; one
+# Chinese character often becomes one or two English tokens
+DEFAULT_MAX_TOKENS_RATIO = {'english': 2.5, 'chinese': 1.0}
+
+
+class ModelTier:
+    """A model choice for requests up to a given size and direction."""
+
+    def __init__(self, model: str, max_chars: Optional[int] = None, directions: Optional[list] = None,
+                 max_tokens_ratio: Optional[float] = None, temperature: float = 0.3):
+        """Initialize the tier.
+
+        Args:
+            model: Model name used for requests in this tier
+            max_chars: Largest input (in characters) handled by this tier, None for no limit
+            directions: Target languages this tier applies to, None for all
+            max_tokens_ratio: Output tokens allowed per input character, None
+                for the default of the target language
+            temperature: Sampling temperature
+        """
+        self.model = model
+        self.max_chars = max_chars
+        self.directions = [d.lower() for d in directions] if directions else None
+        self.max_tokens_ratio = max_tokens_ratio
+        self.temperature = temperature
+
+    @classmethod
+    def from_config(cls, tier_config: dict) -> 'ModelTier':
+        """Create a tier from one entry of the qianwen.tiers config list."""
+        return cls(
+            model=tier_config['model'],
+            max_chars=tier_config.get('max_chars'),
+            directions=tier_config.get('directions'),
+            max_tokens_ratio=tier_config.get('max_tokens_ratio'),
+            temperature=tier_config.get('temperature', 0.3)
+        )
+
+    def matches(self, text: str, target_lang: str) -> bool:
+        """Check whether this tier handles the given request."""
+        if self.directions is not None and target_lang.lower() not in self.directions:
+            return False
+        return self.max_chars is None or len(text) <= self.max_chars
+
+    def max_tokens(self, text: str, target_lang: str) -> int:
+        """Upper bound on output tokens for translating the given text."""
+        ratio = self.max_tokens_ratio
+        if ratio is None:
+            ratio = DEFAULT_MAX_TOKENS_RATIO.get(target_lang.lower(), 2.5)
+        estimate = int(len(text) * ratio) + MIN_MAX_TOKENS
+        return max(MIN_MAX_TOKENS, min(MAX_MAX_TOKENS, estimate))
+
+
+def parse_tiers(tiers_config: Optional[list]) -> List[ModelTier]:
+    """Parse the qianwen.tiers config list, keeping its order."""
+    return [ModelTier.from_config(tier) for tier in tiers_config or []]
+
+
+def select_tier(tiers: List[ModelTier], text: str, target_lang: str) -> Optional[ModelTier]:
+    """Pick the first tier that handles the request.
+
+    Args:
+        tiers: Tiers in priority order (usually smallest first)
+        text: Text to translate
+        target_lang: Target language ('English' or 'Chinese')
+
+    Returns:
+        The matching tier, or None to use the client's default model
+    """
+    for tier in tiers:
+        if tier.matches(text, target_lang):
+            return tier
+    return None
@@ -0,0 +1,100 @@
+"""Helpers for reading Claude Code transcript files."""
+
+import json
+import re
+from typing import Iterator, List, Optional, Tuple
+
+# User-role text written by Claude Code itself rather than typed by the user
+GENERATED_RE = re.compile(r'^\s*<(command-[\w-]+|local-command-[\w-]+|system-reminder)>')
+
+
+def read_last_assistant_message(transcript_path: str) -> Tuple[Optional[str], List[str]]:
+    """Read the text blocks of the last assistant message in a transcript.
+
+    Claude Code writes one transcript line per content block, so a message
+    that interleaves text with tool use is spread over several lines sharing
+    the same message id. All text blocks of that message are returned in order.
+
+    Args:
+        transcript_path: Path to the transcript JSONL file
+
+    Returns:
+        Tuple of (message id or None, list of text blocks)
+    """
+    with open(transcript_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    entries = []
+    message_id = None
+    # Iterate backwards to find the last assistant message
+    for line in reversed(lines):
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        msg = entry.get('message', {})
+        if not isinstance(msg, dict) or msg.get('role') != 'assistant' or msg.get('type') != 'message':
+            continue
+        if entries and msg.get('id') != message_id:
+            break
+        message_id = msg.get('id')
+        entries.append(msg)
+        if message_id is None:
+            # Without an id we cannot tell which lines belong together
+            break
+
+    blocks = []
+    for msg in reversed(entries):
+        content_list = msg.get('content', [])
+        if isinstance(content_list, str):
+            content_list = [{'type': 'text', 'text': content_list}]
+        for content in content_list:
+            if content.get('type') == 'text' and content.get('text', '').strip():
+                blocks.append(content['text'])
+    return message_id, blocks
+
+
+def _text_blocks(content) -> List[str]:
+    if isinstance(content, str):
+        content = [{'type': 'text', 'text': content}]
+    return [block['text'] for block in content
+            if isinstance(block, dict) and block.get('type') == 'text' and block.get('text', '').strip()]
+
+
+def iter_messages(transcript_path: str) -> Iterator[Tuple[str, Optional[str], List[str]]]:
+    """Stream the user and assistant text of a transcript, message by message.
+
+    The file is read line by line, so arbitrarily long sessions can be
+    processed. Consecutive lines of the same assistant message are merged.
+    Meta entries, tool results and command output (e.g. <command-name>,
+    <local-command-stdout>) carry no user-written text and are skipped.
+
+    Args:
+        transcript_path: Path to the transcript JSONL file
+
+    Yields:
+        Tuples of (role, message id or None, list of text blocks)
+    """
+    current = None
+    with open(transcript_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            msg = entry.get('message') if isinstance(entry, dict) else None
+            if not isinstance(msg, dict) or msg.get('role') not in ('user', 'assistant') or entry.get('isMeta'):
+                continue
+            blocks = [block for block in _text_blocks(msg.get('content', []))
+                      if not GENERATED_RE.match(block)]
+            if not blocks:
+                continue
+            role, message_id = msg['role'], msg.get('id')
+            if current and role == 'assistant' and message_id and current[:2] == (role, message_id):
+                current[2].extend(blocks)
+                continue
+            if current:
+                yield current
+            current = (role, message_id, blocks)
+    if current:
+        yield current
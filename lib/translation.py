@@ -0,0 +1,320 @@
+"""Block-level translation with caching and concurrency."""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import markdown
+from .cache import cache_key
+from .deadline import DeadlineExceeded
+
+# Separator placed between content blocks when they are shown as one text
+BLOCK_SEPARATOR = '\n\n'
+
+# Upper bound on the characters sent in one batched request
+MAX_BATCH_CHARS = 4000
+
+# Provider name of the cache entries written when the user confirms a translation
+CONFIRMED_PROVIDER = 'confirmed'
+
+# Result of translate_blocks(); untranslated blocks keep their original text
+# and are marked False in 'translated'
+BlockTranslation = namedtuple('BlockTranslation', ['blocks', 'usage', 'complete', 'cache_hits', 'translated'])
+
+
+def merge_usage(total: Optional[dict], usage: Optional[dict]) -> Optional[dict]:
+    """Add the numeric fields of one usage dict into another.
+
+    Args:
+        total: Accumulated usage (may be None)
+        usage: Usage of a single request (may be None)
+
+    Returns:
+        The combined usage dict, or None if neither had usage
+    """
+    if not usage:
+        return total
+    total = dict(total or {})
+    for name, value in usage.items():
+        if isinstance(value, (int, float)):
+            total[name] = total.get(name, 0) + value
+    return total
+
+
+def client_cache_key(client, text: str, target_lang: str) -> str:
+    """Build the cache key for a text translated by the given client.
+
+    The key includes the model the client routes this text to, so changing
+    the model tiers does not serve translations made by another model.
+    """
+    model_for = getattr(client, 'model_for', None)
+    model = model_for(text, target_lang) if model_for else getattr(client, 'model', '')
+    return cache_key(text, target_lang, getattr(client, 'provider', ''), model)
+
+
+def confirmed_cache_key(text: str, target_lang: str) -> str:
+    """Build the cache key for a translation the user confirmed in the edit dialog.
+
+    These entries are kept apart from the providers' ones, which are stored
+    before and regardless of the dialog, and do not depend on the model.
+    """
+    return cache_key(text, target_lang, CONFIRMED_PROVIDER, '')
+
+
+def translate_text(client, text: str, target_lang: str, deadline=None) -> Tuple[str, Optional[dict]]:
+    """Translate a single text, normalizing the client's return value.
+
+    Args:
+        client: Translation client
+        text: Text to translate
+        target_lang: Target language ('English' or 'Chinese')
+        deadline: Optional Deadline for the request
+
+    Returns:
+        Tuple of (translated text, usage dict or None)
+    """
+    result = client.translate(text, target_lang, deadline=deadline)
+    if isinstance(result, tuple):
+        return result[0], result[1]
+    return result, None
+
+
+def run_concurrently(tasks: Dict[str, Callable], max_workers: int, deadline=None) -> dict:
+    """Run tasks on a thread pool, stopping to wait once the deadline passes.
+
+    Tasks that raise DeadlineExceeded or have not finished by the deadline are
+    left out of the result. Any other exception is re-raised.
+
+    Args:
+        tasks: Mapping of key to zero-argument callable
+        max_workers: Maximum number of concurrent tasks
+        deadline: Optional Deadline
+
+    Returns:
+        Mapping of key to result for every task that completed in time
+    """
+    if not tasks:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))))
+    try:
+        futures = {key: executor.submit(task) for key, task in tasks.items()}
+        wait(futures.values(), timeout=deadline.remaining() if deadline else None)
+        results = {}
+        for key, future in futures.items():
+            if not future.done():
+                future.cancel()
+                continue
+            try:
+                results[key] = future.result()
+            except DeadlineExceeded:
+                continue
+        return results
+    finally:
+        # Requests still running are bounded by the deadline, don't wait for them here
+        executor.shutdown(wait=False)
+
+
+def make_batches(texts: List[str], max_chars: int = MAX_BATCH_CHARS) -> List[List[str]]:
+    """Group texts into as few batches as possible under a size limit.
+
+    Args:
+        texts: Texts to group, kept in order
+        max_chars: Maximum combined length of one batch
+
+    Returns:
+        List of batches
+    """
+    batches = []
+    size = 0
+    for text in texts:
+        if not batches or size + len(text) > max_chars:
+            batches.append([])
+            size = 0
+        batches[-1].append(text)
+        size += len(text) + 1
+    return batches
+
+
+def translate_segments(client, texts: List[str], target_lang: str, max_workers: int = 4,
+                       deadline=None) -> Tuple[List[Optional[str]], Optional[dict]]:
+    """Translate many short segments using as few provider calls as possible.
+
+    Duplicates are translated once. Segments are grouped into batches that
+    are sent concurrently through the client's translate_batch().
+
+    Args:
+        client: Translation client
+        texts: Single-line segments to translate
+        target_lang: Target language ('English' or 'Chinese')
+        max_workers: Maximum number of concurrent provider requests
+        deadline: Optional Deadline; batches not done in time come back as None
+
+    Returns:
+        Tuple of (translated segments in input order, combined usage or None)
+    """
+    unique = list(dict.fromkeys(texts))
+    if not unique:
+        return [], None
+
+    batches = make_batches(unique)
+    results = run_concurrently(
+        {i: (lambda batch=batch: client.translate_batch(batch, target_lang, deadline=deadline))
+         for i, batch in enumerate(batches)},
+        max_workers, deadline
+    )
+
+    translated = {}
+    usage = None
+    for i, (batch_results, batch_usage) in results.items():
+        translated.update(zip(batches[i], batch_results))
+        usage = merge_usage(usage, batch_usage)
+    return [translated.get(text) for text in texts], usage
+
+
+def translate_markdown_documents(client, documents: List[str], target_lang: str, max_workers: int = 4,
+                                 deadline=None, phrasebook=None) -> Tuple[List[Optional[str]], List[str], Optional[dict]]:
+    """Translate Markdown documents by sending only their prose nodes.
+
+    Prose nodes of all documents are batched together and the original
+    Markdown structure of each document is rebuilt around the translations.
+    Nodes found in the phrasebook are translated locally.
+
+    Args:
+        client: Translation client
+        documents: Markdown texts
+        target_lang: Target language ('English' or 'Chinese')
+        max_workers: Maximum number of concurrent provider requests
+        deadline: Optional Deadline
+        phrasebook: Optional Phrasebook for local translations
+
+    Returns:
+        Tuple of (fully translated documents or None, best-effort documents
+        where untranslated nodes keep their original text, combined usage)
+    """
+    segmented = [markdown.segment(document) for document in documents]
+    nodes = [node for _, doc_nodes in segmented for node in doc_nodes]
+
+    local = {}
+    if phrasebook:
+        for node in nodes:
+            hit = phrasebook.lookup(node, target_lang)
+            if hit is not None:
+                local[node] = hit
+    remote = [node for node in nodes if node not in local]
+    translated_remote, usage = translate_segments(client, remote, target_lang, max_workers, deadline)
+    local.update(zip(remote, translated_remote))
+    translated_nodes = [local[node] for node in nodes]
+
+    complete = []
+    partial = []
+    offset = 0
+    for template, doc_nodes in segmented:
+        doc_translations = translated_nodes[offset:offset + len(doc_nodes)]
+        offset += len(doc_nodes)
+        filled = [t if t is not None else node for t, node in zip(doc_translations, doc_nodes)]
+        partial.append(markdown.rebuild(template, filled))
+        complete.append(partial[-1] if None not in doc_translations else None)
+    return complete, partial, usage
+
+
+def translate_blocks(client, blocks: List[str], target_lang: str, cache=None, max_workers: int = 4,
+                     markdown_aware: bool = False, deadline=None, phrasebook=None) -> BlockTranslation:
+    """Translate content blocks independently and return them in order.
+
+    Every block is keyed on its own hash, so a message that repeats or extends
+    an earlier one only pays for the blocks that are new. Cache misses are
+    translated concurrently. When the deadline passes, whatever was translated
+    so far is returned and the remaining blocks keep their original text.
+
+    Args:
+        client: Translation client
+        blocks: Text blocks to translate
+        target_lang: Target language ('English' or 'Chinese')
+        cache: Optional TranslationCache
+        max_workers: Maximum number of concurrent provider requests
+        markdown_aware: Send only the Markdown prose nodes of each block
+        deadline: Optional Deadline
+        phrasebook: Optional Phrasebook translating known phrases locally
+
+    Returns:
+        BlockTranslation with the translated blocks, combined usage, whether
+        every block was translated, how many blocks came from the cache, and
+        for each block whether it was translated
+    """
+    keys = [client_cache_key(client, block, target_lang) for block in blocks]
+    cached: Dict[str, str] = cache.get_many(keys) if cache else {}
+    cache_hits = sum(1 for key in keys if key in cached)
+
+    # Translate each distinct missing block once, known phrases locally
+    pending = {}
+    for key, block in zip(keys, blocks):
+        if key in cached or key in pending:
+            continue
+        hit = phrasebook.lookup(block, target_lang) if phrasebook else None
+        if hit is not None:
+            cached[key] = hit
+        else:
+            pending[key] = block
+
+    usage = None
+    translated = {}
+    fallback = {}
+    if pending and markdown_aware:
+        complete, partial, usage = translate_markdown_documents(
+            client, list(pending.values()), target_lang, max_workers, deadline, phrasebook
+        )
+        for key, full, best in zip(pending, complete, partial):
+            if full is not None:
+                translated[key] = full
+            fallback[key] = best
+    elif pending:
+        results = run_concurrently(
+            {key: (lambda block=block: translate_text(client, block, target_lang, deadline))
+             for key, block in pending.items()},
+            max_workers, deadline
+        )
+        for key, (text, block_usage) in results.items():
+            translated[key] = text
+            usage = merge_usage(usage, block_usage)
+
+    if translated and cache:
+        cache.put_many({key: (pending[key], translated[key]) for key in translated})
+    cached.update(translated)
+
+    result = [cached.get(key, fallback.get(key, block)) for key, block in zip(keys, blocks)]
+    return BlockTranslation(result, usage, len(translated) == len(pending), cache_hits,
+                            [key in cached for key in keys])
+
+
+class StreamCollector:
+    """Iterates a translation stream while keeping the full text it produced.
+
+    The edit dialog consumes the pieces; the hook afterwards checks whether
+    the stream completed and caches the unedited translation.
+    """
+
+    def __init__(self, stream):
+        """Initialize the collector.
+
+        Args:
+            stream: Iterable of translated text pieces
+        """
+        self.stream = stream
+        self.pieces: List[str] = []
+        self.complete = False
+        self.error: Optional[Exception] = None
+
+    def __iter__(self):
+        try:
+            for piece in self.stream:
+                self.pieces.append(piece)
+                yield piece
+            self.complete = True
+        except Exception as e:
+            self.error = e
+            raise
+
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        return ''.join(self.pieces)
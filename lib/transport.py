@@ -0,0 +1,339 @@
+"""HTTP transports used by the provider and shared cache clients.
+
+Every client only POSTs JSON, so the default transport is built on the
+standard library's http.client: importing `requests` (with urllib3 and
+charset_normalizer) is a noticeable share of each hook process's startup
+time and memory. The `requests` transport is still used when it is needed,
+i.e. when a proxy is configured.
+"""
+
+import gzip
+import http.client
+import importlib.util
+import json
+import os
+import ssl
+import threading
+import urllib.request
+import zlib
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from .deadline import DEFAULT_TIMEOUT
+
+TRANSPORTS = ('auto', 'stdlib', 'requests')
+
+# CA bundle variables of requests, also honored by the stdlib transport
+CA_BUNDLE_ENV = ('REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE')
+
+_transports: Dict[str, object] = {}
+_transports_lock = threading.Lock()
+
+
+class TransportError(Exception):
+    """Raised for connection errors, timeouts and HTTP error statuses."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def _iter_decoded_lines(chunks: Iterator[bytes]) -> Iterator[str]:
+    """Split a stream of byte chunks into decoded lines without line endings."""
+    buffer = b''
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line.rstrip(b'\r').decode('utf-8', 'replace')
+    if buffer:
+        yield buffer.rstrip(b'\r').decode('utf-8', 'replace')
+
+
+class HTTPResponse:
+    """Response of the http.client transport."""
+
+    def __init__(self, raw: http.client.HTTPResponse, release, discard, stream: bool):
+        """Initialize the response.
+
+        Args:
+            raw: Underlying http.client response
+            release: Callback returning the connection to the pool
+            discard: Callback closing the connection
+            stream: Whether the body is read lazily through iter_lines()
+        """
+        self.status = raw.status
+        self.headers = raw.headers
+        self._raw = raw
+        self._release = release
+        self._discard = discard
+        self._gzip = (raw.getheader('Content-Encoding') or '').lower() == 'gzip'
+        self._body = None
+        self._done = False
+        if not stream:
+            self._read_all()
+
+    def _read_all(self):
+        try:
+            data = self._raw.read()
+        except (OSError, http.client.HTTPException) as e:
+            self._finish(False)
+            raise TransportError(f"Error reading response: {e}")
+        self._body = gzip.decompress(data) if self._gzip and data else data
+        self._finish(True)
+
+    def _finish(self, complete: bool):
+        if self._done:
+            return
+        self._done = True
+        if complete and not self._raw.will_close:
+            self._release()
+        else:
+            self._discard()
+
+    @property
+    def content(self) -> bytes:
+        """The whole (decompressed) body."""
+        if self._body is None:
+            self._read_all()
+        return self._body
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self):
+        """Parse the body as JSON.
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        return json.loads(self.content)
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the body line by line as it arrives (e.g. server-sent events)."""
+        if self._body is not None:
+            yield from _iter_decoded_lines(iter([self._body]))
+            return
+        yield from _iter_decoded_lines(self._iter_chunks())
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if self._gzip else None
+        try:
+            while True:
+                chunk = self._raw.read1(8192)
+                if not chunk:
+                    break
+                yield decompressor.decompress(chunk) if decompressor else chunk
+            if decompressor:
+                yield decompressor.flush()
+        except (OSError, http.client.HTTPException, zlib.error) as e:
+            self._finish(False)
+            raise TransportError(f"Error reading response: {e}")
+        self._finish(True)
+
+    def close(self):
+        """Release the connection; a partly read body closes it."""
+        self._finish(False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HTTPClientTransport:
+    """Transport built on http.client with per-host keep-alive connections.
+
+    Idle connections are pooled per host and shared between threads, so the
+    concurrent requests of one hook reuse the connections of earlier ones.
+    """
+
+    name = 'stdlib'
+
+    def __init__(self):
+        self._idle: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = None
+
+    def _context(self) -> ssl.SSLContext:
+        # Created on first HTTPS use; loading the CA certificates takes a while
+        if self._ssl_context is None:
+            cafile = next((os.environ[name] for name in CA_BUNDLE_ENV if os.environ.get(name)), None)
+            self._ssl_context = ssl.create_default_context(cafile=cafile)
+        return self._ssl_context
+
+    def _acquire(self, key: tuple, timeout: float):
+        with self._lock:
+            pool = self._idle.get(key)
+            conn = pool.pop() if pool else None
+        reused = conn is not None
+        if conn is None:
+            scheme, host = key
+            if scheme == 'https':
+                conn = http.client.HTTPSConnection(host, timeout=timeout, context=self._context())
+            else:
+                conn = http.client.HTTPConnection(host, timeout=timeout)
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, reused
+
+    def _release(self, key: tuple, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def post_json(self, url: str, payload, headers: Optional[dict] = None,
+                  timeout: float = DEFAULT_TIMEOUT, stream: bool = False) -> HTTPResponse:
+        """POST a JSON payload.
+
+        Args:
+            url: Request URL
+            payload: JSON-serializable request body
+            headers: Extra request headers
+            timeout: Socket timeout in seconds
+            stream: Read the body lazily through iter_lines()
+
+        Returns:
+            HTTPResponse with a 2xx or 3xx status
+
+        Raises:
+            TransportError: On connection errors, timeouts and 4xx/5xx statuses
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme or 'http', parts.netloc)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        request_headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip"}
+        request_headers.update(headers or {})
+
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request('POST', path, body=body, headers=request_headers)
+                raw = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                # The server dropped an idle keep-alive connection; retry on a new one
+                if reused:
+                    continue
+                raise TransportError(f"Connection error: {e}")
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise TransportError(f"Connection error: {e}")
+
+        response = HTTPResponse(raw, lambda: self._release(key, conn), conn.close, stream)
+        if response.status >= 400:
+            reason = raw.reason
+            response.close()
+            raise TransportError(f"{response.status} {reason} for url: {url}", status=response.status)
+        return response
+
+
+class RequestsResponse:
+    """Response of the requests transport, with the same interface as HTTPResponse."""
+
+    def __init__(self, response):
+        self.status = response.status_code
+        self.headers = response.headers
+        self._response = response
+        self._response.encoding = 'utf-8'
+
+    @property
+    def content(self) -> bytes:
+        return self._response.content
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    def json(self):
+        return self._response.json()
+
+    def iter_lines(self) -> Iterator[str]:
+        import requests
+        try:
+            yield from self._response.iter_lines(decode_unicode=True)
+        except requests.exceptions.RequestException as e:
+            raise TransportError(f"Error reading response: {e}")
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RequestsTransport:
+    """Transport built on a requests Session (proxy support)."""
+
+    name = 'requests'
+
+    def __init__(self):
+        import requests
+        self._requests = requests
+        self._session = requests.Session()
+
+    def post_json(self, url: str, payload, headers: Optional[dict] = None,
+                  timeout: float = DEFAULT_TIMEOUT, stream: bool = False) -> RequestsResponse:
+        """POST a JSON payload; see HTTPClientTransport.post_json()."""
+        try:
+            response = self._session.post(url, headers=headers, json=payload, timeout=timeout, stream=stream)
+            response.raise_for_status()
+        except self._requests.exceptions.RequestException as e:
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            raise TransportError(str(e), status=status)
+        return RequestsResponse(response)
+
+
+def requests_needed() -> bool:
+    """Check whether a proxy is configured, which only requests supports.
+
+    Uses the same lookup as requests: *_proxy environment variables in any
+    case, and the system settings on macOS and Windows. NO_PROXY alone does
+    not count.
+    """
+    return any(scheme != 'no' for scheme in urllib.request.getproxies())
+
+
+def resolve_transport_name(name: Optional[str] = None) -> str:
+    """Resolve 'auto' (or None) to 'stdlib' or 'requests'.
+
+    Args:
+        name: 'auto', 'stdlib' or 'requests'
+
+    Returns:
+        'stdlib' or 'requests'
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    name = name or 'auto'
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {name} (expected one of {', '.join(TRANSPORTS)})")
+    if name == 'auto':
+        if requests_needed() and importlib.util.find_spec('requests') is not None:
+            return 'requests'
+        return 'stdlib'
+    return name
+
+
+def get_transport(name: Optional[str] = None):
+    """Return the process-wide transport of the given kind.
+
+    Args:
+        name: 'auto' (default), 'stdlib' or 'requests'
+
+    Returns:
+        HTTPClientTransport or RequestsTransport, shared by all clients
+    """
+    name = resolve_transport_name(name)
+    with _transports_lock:
+        if name not in _transports:
+            _transports[name] = RequestsTransport() if name == 'requests' else HTTPClientTransport()
+        return _transports[name]
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.paths import DATA_DIR_ENV  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Keep stats, caches and stores written by the code under test out of data/."""
+    directory = tmp_path / 'data'
+    monkeypatch.setenv(DATA_DIR_ENV, str(directory))
+    return directory
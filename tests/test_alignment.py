@@ -0,0 +1,44 @@
+"""Tests for sentence alignment between answers and their translations."""
+
+from lib.alignment import AlignmentStore, align, normalize_sentence, split_sentences
+
+
+def test_lines_and_sentences_are_paired():
+    source = "# Setup\n\nThe cache is stored in SQLite. It is pruned daily.\n- Restart the server first."
+    translation = "# 设置步骤\n\n缓存存储在 SQLite 中。它每天都会被清理。\n- 请先重启服务器。"
+    pairs = dict(align(source, translation))
+    assert pairs["缓存存储在 SQLite 中。它每天都会被清理。"] == "The cache is stored in SQLite. It is pruned daily."
+    assert pairs["它每天都会被清理。"] == "It is pruned daily."
+    assert pairs["请先重启服务器。"] == "Restart the server first."
+    assert pairs["设置步骤"] == "Setup"
+
+
+def test_short_and_untranslated_lines_are_skipped():
+    pairs = dict(align("OK\n`make test`", "好的\n`make test`"))
+    assert pairs == {}
+
+
+def test_sentence_count_mismatch_keeps_only_the_line():
+    pairs = align("First point. Second point.", "第一点和第二点都很重要。")
+    assert pairs == [("第一点和第二点都很重要。", "First point. Second point.")]
+
+
+def test_line_count_mismatch():
+    assert align("One line of text here.", "第一行译文\n第二行译文") == [("第一行译文\n第二行译文", "One line of text here.")]
+    assert align("Line one is here.\nLine two is here.", "只有一行译文内容") == []
+
+
+def test_split_and_normalize():
+    assert split_sentences("你好。再见！", True) == ["你好。", "再见！"]
+    assert split_sentences("Hello there. Bye now!", False) == ["Hello there.", "Bye now!"]
+    assert normalize_sentence("  “它每天都会被清理。” ") == normalize_sentence("它每天都会被清理")
+
+
+def test_substitute_quoted_sentence(tmp_path):
+    store = AlignmentStore(str(tmp_path / 'alignment.sqlite3'))
+    store.add(["The cache is stored in SQLite. It is pruned daily."],
+              ["缓存存储在 SQLite 中。它每天都会被清理。"])
+    assert store.substitute("你说“它每天都会被清理。”，为什么？") == ("你说“It is pruned daily.”，为什么？", 1)
+    assert store.substitute("> 缓存存储在 SQLite 中。它每天都会被清理。") == (
+        "> The cache is stored in SQLite. It is pruned daily.", 1)
+    assert store.substitute("完全无关的新问题") == ("完全无关的新问题", 0)
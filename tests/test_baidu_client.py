@@ -0,0 +1,45 @@
+"""Tests for the Baidu request chunking and line alignment helpers."""
+
+import pytest
+
+from lib.baidu_client import BaiduClient, split_long_line
+
+
+def test_short_line_is_one_piece():
+    assert split_long_line("Hello world.", 100) == ["Hello world."]
+
+
+def test_split_at_sentence_ends_and_rejoin():
+    line = "First sentence. Second sentence. Third sentence."
+    pieces = split_long_line(line, 20)
+    assert ''.join(pieces) == line
+    assert all(len(piece.encode('utf-8')) <= 20 for piece in pieces)
+    assert pieces[0] == "First sentence. "
+
+
+def test_split_without_break_points_respects_character_boundaries():
+    line = "中" * 10
+    pieces = split_long_line(line, 7)
+    assert ''.join(pieces) == line
+    assert all(len(piece.encode('utf-8')) <= 7 for piece in pieces)
+    assert pieces[0] == "中" * 2
+
+
+def test_align_in_order():
+    result = [{"src": "one", "dst": "1"}, {"src": "two", "dst": "2"}]
+    assert BaiduClient._align(["one", "two"], result) == ["1", "2"]
+
+
+def test_align_reordered_results():
+    result = [{"src": "two ", "dst": "2"}, {"src": "one", "dst": "1"}]
+    assert BaiduClient._align(["one", "two"], result) == ["1", "2"]
+
+
+def test_align_duplicate_lines():
+    result = [{"src": "same", "dst": "a"}, {"src": "other", "dst": "b"}, {"src": "same", "dst": "c"}]
+    assert BaiduClient._align(["other", "same", "same"], result) == ["b", "a", "c"]
+
+
+def test_align_missing_line_raises():
+    with pytest.raises(ValueError):
+        BaiduClient._align(["one", "two"], [{"src": "one", "dst": "1"}])
@@ -0,0 +1,88 @@
+"""Tests for the per-prompt confirmation policy."""
+
+import pytest
+
+from lib.confirm_policy import AUTO, COUNTDOWN, DIALOG, AcceptanceStore, ConfirmPolicy
+
+SHORT = '你好' * 10
+MEDIUM = '你好' * 200
+LONG = '你好' * 1000
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AcceptanceStore(str(tmp_path / 'acceptance.json'))
+
+
+def make_history(store, accepted, rejected=0):
+    for _ in range(rejected):
+        store.record(False)
+    for _ in range(accepted):
+        store.record(True)
+
+
+@pytest.mark.parametrize('source', ['confirmed', 'phrasebook', 'aligned'])
+def test_trusted_sources_skip_the_dialog(store, source):
+    policy = ConfirmPolicy(store)
+
+    assert policy.decide(SHORT, source).action == AUTO
+    assert policy.decide(MEDIUM, source).action == COUNTDOWN
+    assert policy.decide(LONG, source).action == DIALOG
+
+
+@pytest.mark.parametrize('source', ['cached', 'phrasebook_template', 'translated'])
+def test_untrusted_sources_need_the_dialog_without_history(store, source):
+    decision = ConfirmPolicy(store).decide(SHORT, source)
+
+    assert decision.action == DIALOG
+    assert decision.reason == 'no history'
+    assert decision.signals['source'] == source
+
+
+def test_acceptance_history_earns_auto_and_countdown(store):
+    policy = ConfirmPolicy(store, min_samples=10)
+    make_history(store, accepted=9)
+    assert policy.decide(SHORT, 'cached').action == DIALOG
+
+    make_history(store, accepted=1)
+    assert policy.decide(SHORT, 'cached').action == AUTO
+    assert policy.decide(MEDIUM, 'cached').action == COUNTDOWN
+    assert policy.decide(LONG, 'cached').reason == 'long or low acceptance'
+
+
+def test_low_acceptance_keeps_the_dialog(store):
+    policy = ConfirmPolicy(store)
+    make_history(store, accepted=5, rejected=20)
+
+    assert policy.decide(SHORT, 'translated').action == DIALOG
+
+
+def test_code_does_not_count_towards_the_length_limits(store):
+    prompt = SHORT + '\n```\n' + 'x = 1\n' * 200 + '```'
+
+    decision = ConfirmPolicy(store).decide(prompt, 'aligned')
+
+    assert decision.action == AUTO
+    assert decision.signals['prose_chars'] < decision.signals['chars']
+
+
+def test_record_learns_from_dialogs_only(store):
+    policy = ConfirmPolicy(store)
+
+    policy.record(policy.decide(SHORT, 'confirmed'), confirmed=True, edited=False)
+    assert store.get() == {}
+
+    dialog = policy.decide(SHORT, 'translated')
+    policy.record(dialog, confirmed=True, edited=False)
+    assert store.get()['rate'] == 1.0
+
+    policy.record(dialog, confirmed=True, edited=True)
+    policy.record(dialog, confirmed=False, edited=False)
+    history = store.get()
+    assert history['samples'] == 3
+    assert history['rate'] < 1.0
+
+
+def test_disabled_policy(store):
+    assert ConfirmPolicy.from_config({'confirm_policy': {'enabled': False}}) is None
+    assert ConfirmPolicy.from_config({'confirm_policy': {'auto_max_chars': 5}}).auto_max_chars == 5
@@ -0,0 +1,90 @@
+"""Tests for the Markdown segmenter."""
+
+from lib.markdown import is_translatable, rebuild, segment
+
+
+def test_wrapped_paragraph_is_one_node():
+    text = "Some paragraph that wraps\nonto a second line, mid-sentence.\n\nNext paragraph.\n"
+    template, nodes = segment(text)
+    assert nodes == ["Some paragraph that wraps onto a second line, mid-sentence.", "Next paragraph."]
+    assert rebuild(template, ['A', 'B']) == "A\n\nB\n"
+
+
+def test_single_lines_rebuild_exactly():
+    text = "# Title\n\n- first item\n- second item\n\n> quoted text here\n"
+    template, nodes = segment(text)
+    assert nodes == ["Title", "first item", "second item", "quoted text here"]
+    assert rebuild(template, nodes) == text
+
+
+def test_list_item_continuation_joins_item():
+    template, nodes = segment("- an item that is\n  wrapped onto two lines\n- next item\n")
+    assert nodes == ["an item that is wrapped onto two lines", "next item"]
+    assert rebuild(template, ['X', 'Y']) == "- X\n- Y\n"
+
+
+def test_quote_depth_change_starts_new_paragraph():
+    _, nodes = segment("> outer quote text\n> > inner quote text\n")
+    assert nodes == ["outer quote text", "inner quote text"]
+
+
+def test_fenced_code_is_literal():
+    text = "Run this command:\n\n```python\nprint('hello world')\n```\n"
+    template, nodes = segment(text)
+    assert nodes == ["Run this command:"]
+    assert rebuild(template, nodes) == text
+
+
+def test_indented_code_after_blank_is_literal():
+    text = "Example:\n\n    indented code block = foo(bar)\n    more code here\n\nDone now.\n"
+    template, nodes = segment(text)
+    assert nodes == ["Example:", "Done now."]
+    assert rebuild(template, nodes) == text
+
+
+def test_indented_line_continues_open_paragraph():
+    _, nodes = segment("A paragraph line\n    continued with indentation\n")
+    assert nodes == ["A paragraph line continued with indentation"]
+
+
+def test_list_paragraph_is_not_code():
+    _, nodes = segment("1. First step\n\n   Explanation of the step.\n\n       code_in_list()\n")
+    assert nodes == ["First step", "Explanation of the step."]
+
+
+def test_table_cells_and_separator():
+    text = "| Name | Value |\n|------|-------|\n| retries | 3 |\n"
+    template, nodes = segment(text)
+    assert nodes == ["Name", "Value", "retries"]
+    assert rebuild(template, nodes) == text
+
+
+def test_setext_underline_is_literal():
+    _, nodes = segment("Heading text\n============\n")
+    assert nodes == ["Heading text"]
+
+
+def test_is_translatable():
+    assert is_translatable("Run the tests")
+    assert not is_translatable("42 / 7")
+    assert not is_translatable("`foo()` src/lib/main.py")
+    assert not is_translatable("已经是中文了")
+
+
+def test_hard_line_breaks_are_kept():
+    for text in ("A first line here  \nsecond line there\n", "A first line here\\\nsecond line there\n"):
+        template, nodes = segment(text)
+        assert nodes == ["A first line here", "second line there"]
+        assert rebuild(template, nodes) == text
+
+
+def test_table_without_leading_pipes():
+    text = "Header | Other\n--- | ---\ncell one | cell two\n\nAfter the table.\n"
+    template, nodes = segment(text)
+    assert nodes == ["Header", "Other", "cell one", "cell two", "After the table."]
+    assert rebuild(template, nodes) == text
+
+
+def test_pipe_in_prose_is_not_a_table():
+    _, nodes = segment("Use a | b to pipe output\ninto another command.\n")
+    assert nodes == ["Use a | b to pipe output into another command."]
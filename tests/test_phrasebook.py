@@ -0,0 +1,76 @@
+"""Tests for the offline phrasebook."""
+
+import json
+import os
+import sys
+
+import pytest
+
+from lib.phrasebook import Phrasebook, compile_phrasebook, escape_phrase, validate_source
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
+from phrasebook import add_phrase  # noqa: E402
+
+
+def make(entries, lang='Chinese'):
+    return Phrasebook(compile_phrasebook({lang: entries}))
+
+
+def test_exact_phrase_ignores_case_and_spacing():
+    book = make([{'source': 'Do you want to proceed?', 'target': '是否继续？'}])
+    assert book.lookup('do you  want to proceed?', 'Chinese') == '是否继续？'
+    assert book.lookup('Do you want to proceed?', 'English') is None
+
+
+def test_template_keeps_slot_value_case():
+    book = make([{'source': 'Let me read {file}.', 'target': '让我读取 {file}。'}])
+    assert book.lookup('Let me read README.md.', 'Chinese') == '让我读取 README.md。'
+    assert book.lookup('Let me read `src/my file.py`.', 'Chinese') == '让我读取 `src/my file.py`。'
+
+
+def test_slot_does_not_swallow_prose():
+    book = make([{'source': 'Let me read {file}.', 'target': '让我读取 {file}。'}])
+    assert book.lookup('Let me read the docs and then rewrite the parser.', 'Chinese') is None
+
+
+def test_slot_rejects_untranslated_text():
+    book = make([{'source': '运行 {command}', 'target': 'Run {command}'},
+                 {'source': '帮我看看 {file}', 'target': 'Take a look at {file} for me'}], 'English')
+    assert book.lookup('运行 pytest', 'English') == 'Run pytest'
+    assert book.lookup('运行 所有的单元测试并修复失败的用例', 'English') is None
+    assert book.lookup('帮我看看 这个函数为什么这么慢…', 'English') is None
+
+
+def test_escaped_braces_are_literal():
+    book = make([{'source': escape_phrase('compare {a} with {a}'), 'target': escape_phrase('比较 {a} 和 {a}')}])
+    assert book.lookup('compare {a} with {a}', 'Chinese') == '比较 {a} 和 {a}'
+
+
+def test_invalid_templates_are_skipped():
+    book = make([{'source': '打印 {0} 的值', 'target': 'x'},
+                 {'source': 'compare {a} with {a}', 'target': 'y'},
+                 {'source': 'Yes', 'target': '是'}])
+    assert book.lookup('Yes', 'Chinese') == '是'
+    assert book.compiled['chinese']['templates'] == []
+
+
+def test_validate_source():
+    assert validate_source('open {file}') is None
+    assert validate_source('{{literal}} braces') is None
+    assert 'invalid slot name' in validate_source('print {0}')
+    assert 'more than once' in validate_source('compare {a} with {A}')
+
+
+def test_add_phrase_rejects_invalid_slots():
+    phrases = {}
+    with pytest.raises(ValueError):
+        add_phrase(phrases, 'compare {a} with {a}', 'y', 'Chinese')
+    assert add_phrase(phrases, 'Open {file}', '打开 {file}', 'Chinese')
+    assert not add_phrase(phrases, 'open  {file}', '打开 {file}', 'Chinese')
+
+
+def test_load_falls_back_to_empty_phrasebook(tmp_path):
+    source = tmp_path / 'phrasebook.json'
+    source.write_text(json.dumps({'Chinese': [{'source': 'missing target'}]}), encoding='utf-8')
+    book = Phrasebook.load(str(source), str(tmp_path / 'compiled.json'))
+    assert book.lookup('missing target', 'Chinese') is None
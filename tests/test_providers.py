@@ -0,0 +1,71 @@
+"""Tests for health-based routing and failover."""
+
+import pytest
+
+from lib.deadline import DeadlineExceeded
+from lib.health import HealthStore
+from lib.providers import MonitoredClient
+
+
+class FakeClient:
+    def __init__(self, provider, error=None):
+        self.provider = provider
+        self.model = 'default'
+        self.error = error
+
+    def model_for(self, text, target_lang):
+        return 'small' if len(text) < 10 else 'default'
+
+    def translate(self, text, target_lang, deadline=None):
+        if self.error:
+            raise self.error
+        return f"{self.provider}:{text}", None
+
+    def translate_stream(self, text, target_lang, deadline=None):
+        if self.error:
+            raise self.error
+        yield f"{self.provider}:{text}"
+
+
+def make(*clients, threshold=1):
+    health = HealthStore(failure_threshold=threshold)
+    return MonitoredClient(list(clients), health), health
+
+
+def test_health_is_recorded_for_the_routed_model():
+    client, health = make(FakeClient('a', Exception('down')), FakeClient('b'))
+    assert client.translate('short', 'English') == ('b:short', None)
+    assert not health.is_available('a', 'small')
+    assert health.is_available('a', 'default')
+
+
+def test_open_circuit_is_skipped_for_that_model_only():
+    primary = FakeClient('a', Exception('down'))
+    client, _ = make(primary, FakeClient('b'))
+    client.translate('short', 'English')
+    primary.error = None
+    assert client.translate('short', 'English')[0] == 'b:short'
+    assert client.translate('a much longer text', 'English')[0] == 'a:a much longer text'
+
+
+def test_deadline_is_not_a_provider_failure():
+    client, health = make(FakeClient('a', DeadlineExceeded('budget')), FakeClient('b'))
+    with pytest.raises(DeadlineExceeded):
+        client.translate('short', 'English')
+    with pytest.raises(DeadlineExceeded):
+        list(client.translate_stream('short', 'English'))
+    assert health.get('a', 'small') == {}
+
+
+def test_stream_fails_over_before_the_first_piece():
+    client, health = make(FakeClient('a', Exception('down')), FakeClient('b'))
+    assert list(client.translate_stream('short', 'English')) == ['b:short']
+    assert health.get('a', 'small')['consecutive_failures'] == 1
+
+
+def test_attributes_come_from_the_configured_primary():
+    primary = FakeClient('a')
+    client = MonitoredClient([primary, FakeClient('b')], HealthStore())
+    client.clients = list(reversed(client.clients))
+    assert client.provider == 'a+b'
+    assert client.model == 'default'
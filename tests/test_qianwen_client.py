@@ -0,0 +1,64 @@
+"""Tests for Qianwen tier routing and truncated responses."""
+
+import pytest
+
+from lib.qianwen_client import QianwenClient
+from lib.tiering import ModelTier
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FakeTransport:
+    """Answers with the queued finish reasons, recording every payload."""
+
+    def __init__(self, finish_reasons):
+        self.finish_reasons = list(finish_reasons)
+        self.payloads = []
+
+    def post_json(self, url, payload, headers=None, timeout=None, stream=False):
+        self.payloads.append(dict(payload))
+        return FakeResponse({
+            'choices': [{'message': {'content': 'text'}, 'finish_reason': self.finish_reasons.pop(0)}],
+            'usage': {'total_tokens': 10}
+        })
+
+
+def make_client(finish_reasons, tiers=None):
+    transport = FakeTransport(finish_reasons)
+    return QianwenClient('http://mock', 'key', 'qwen-plus', tiers=tiers, transport=transport), transport
+
+
+def test_default_ratio_depends_on_direction():
+    tier = ModelTier('qwen-turbo')
+    assert tier.max_tokens('x' * 100, 'English') == 250 + 64
+    assert tier.max_tokens('x' * 100, 'Chinese') == 100 + 64
+    assert ModelTier('qwen-turbo', max_tokens_ratio=1.5).max_tokens('x' * 100, 'English') == 150 + 64
+
+
+def test_truncated_by_tier_bound_is_retried_without_it():
+    client, transport = make_client(['length', 'stop'], tiers=[{'model': 'qwen-turbo'}])
+    text, usage = client.translate('你好', 'English')
+    assert text == 'text'
+    assert 'max_tokens' in transport.payloads[0]
+    assert 'max_tokens' not in transport.payloads[1]
+    assert usage['total_tokens'] == 20
+
+
+def test_truncated_without_bound_is_an_error():
+    client, _ = make_client(['length'])
+    with pytest.raises(Exception, match='truncated'):
+        client.translate('你好', 'English')
+
+
+def test_routed_model():
+    client, transport = make_client(['stop'], tiers=[{'model': 'qwen-turbo', 'max_chars': 10}])
+    assert client.model_for('short', 'English') == 'qwen-turbo'
+    assert client.model_for('x' * 20, 'English') == 'qwen-plus'
+    client.translate('short', 'English')
+    assert transport.payloads[0]['model'] == 'qwen-turbo'
@@ -0,0 +1,92 @@
+"""Tests for translating only the prose of mixed prompts."""
+
+from lib.deadline import DeadlineExceeded
+from lib.selective import prose_chars, split_prompt, translate_prompt, translate_prompt_stream
+
+
+class FakeClient:
+    provider = 'fake'
+    model = 'fake'
+
+    def __init__(self, slow=None):
+        self.slow = slow
+        self.sent = []
+
+    def translate(self, text, target_lang, deadline=None):
+        self.sent.append(text)
+        if self.slow and self.slow in text:
+            raise DeadlineExceeded('out of time')
+        return f"<{text}>", {'total_tokens': 1}
+
+    def translate_stream(self, text, target_lang, deadline=None):
+        self.sent.append(text)
+        yield '<'
+        yield text
+        yield '>'
+
+
+PROMPT = '\n'.join([
+    '这个报错怎么修？',
+    '第二行说明',
+    'Traceback (most recent call last):',
+    '  File "app.py", line 3',
+    '```python',
+    'print("中文字符串")',
+    '```',
+    '    缩进的问题',
+])
+TRANSLATED = '\n'.join([
+    '<这个报错怎么修？\n第二行说明>',
+    'Traceback (most recent call last):',
+    '  File "app.py", line 3',
+    '```python',
+    'print("中文字符串")',
+    '```',
+    '    <缩进的问题>',
+])
+
+
+def test_split_prompt_round_trips():
+    parts = split_prompt(PROMPT)
+
+    assert '\n'.join(text for text, _ in parts) == PROMPT
+    assert prose_chars(parts) == len('这个报错怎么修？\n第二行说明') + len('    缩进的问题')
+
+
+def test_consecutive_prose_lines_form_one_segment():
+    parts = split_prompt(PROMPT)
+
+    assert parts[0] == ('这个报错怎么修？\n第二行说明', True)
+
+
+def test_fenced_code_with_chinese_is_not_prose():
+    parts = split_prompt(PROMPT)
+
+    assert ('Traceback (most recent call last):\n  File "app.py", line 3\n'
+            '```python\nprint("中文字符串")\n```', False) in parts
+
+
+def test_translate_prompt_sends_only_prose_and_keeps_indentation():
+    client = FakeClient()
+
+    translated, usage, _ = translate_prompt(client, PROMPT)
+
+    assert sorted(client.sent) == ['缩进的问题', '这个报错怎么修？\n第二行说明']
+    assert translated == TRANSLATED
+    assert usage
+
+
+def test_translate_prompt_passes_through_when_incomplete():
+    translated, usage, parts = translate_prompt(FakeClient(slow='缩进'), PROMPT)
+
+    assert translated is None
+    assert parts == split_prompt(PROMPT)
+
+
+def test_translate_prompt_stream_keeps_layout():
+    client = FakeClient()
+
+    translated = ''.join(translate_prompt_stream(client, PROMPT))
+
+    assert translated == TRANSLATED
+    assert client.sent == ['这个报错怎么修？\n第二行说明', '缩进的问题']
@@ -0,0 +1,51 @@
+"""Tests for the shared cache tier giving up on a failed service."""
+
+import socket
+import time
+
+import pytest
+
+from lib import shared_cache
+from lib.shared_cache import SharedCacheClient
+from lib.transport import get_transport
+
+
+@pytest.fixture
+def silent_server():
+    """A server that accepts connections but never answers."""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(8)
+    host, port = server.getsockname()
+    yield f'http://{host}:{port}'
+    server.close()
+
+
+@pytest.fixture(autouse=True)
+def forget_dead_urls():
+    shared_cache._dead_urls.clear()
+    yield
+    shared_cache._dead_urls.clear()
+
+
+def test_hung_cache_is_only_waited_for_once(silent_server):
+    client = SharedCacheClient(silent_server, timeout=0.2, transport=get_transport('stdlib'))
+
+    assert client.get_many(['a']) == {}
+    assert client.dead
+
+    started = time.monotonic()
+    assert client.get_many(['b']) == {}
+    assert SharedCacheClient(silent_server, timeout=0.2, transport=get_transport('stdlib')).get_many(['c']) == {}
+    assert time.monotonic() - started < 0.05
+
+
+def test_put_many_does_not_block(silent_server):
+    client = SharedCacheClient(silent_server, timeout=0.2, transport=get_transport('stdlib'))
+
+    started = time.monotonic()
+    client.put_many({'a': ('source', 'translation')})
+    assert time.monotonic() - started < 0.05
+
+    shared_cache._finish_writes()
+    assert client.dead
@@ -0,0 +1,153 @@
+"""Tests for the stdlib HTTP transport against a local server."""
+
+import gzip
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lib.transport import HTTPClientTransport, TransportError, requests_needed, resolve_transport_name
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests.append((self.path, self.client_address))
+        if self.path.startswith('/status/'):
+            self.send_body(int(self.path.rsplit('/', 1)[1]), b'{}')
+        elif self.path == '/gzip':
+            data = gzip.compress(body)
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        elif self.path == '/sse':
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in (b'data: one\r\n\r\ndata: t', b'wo\n\n', b'data: [DONE]\n'):
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                self.wfile.flush()
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_body(200, body)
+            # Drop the connection without announcing it, like an idle timeout
+            self.close_connection = self.path == '/drop'
+
+    def send_body(self, status, data):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    host, port = server.server_address
+    server.url = f'http://{host}:{port}'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_keep_alive_reuses_the_connection(server):
+    transport = HTTPClientTransport()
+
+    assert transport.post_json(f'{server.url}/echo', {'n': 1}).json() == {'n': 1}
+    assert transport.post_json(f'{server.url}/echo', {'n': 2}).json() == {'n': 2}
+
+    (_, first), (_, second) = server.requests
+    assert first == second
+
+
+def test_dropped_idle_connection_is_retried(server):
+    transport = HTTPClientTransport()
+
+    transport.post_json(f'{server.url}/drop', {'n': 1})
+    assert transport.post_json(f'{server.url}/echo', {'n': 2}).json() == {'n': 2}
+
+    (_, first), (_, second) = server.requests
+    assert first != second
+
+
+def test_gzip_body_is_decompressed(server):
+    response = HTTPClientTransport().post_json(f'{server.url}/gzip', {'text': '你好'})
+
+    assert response.json() == {'text': '你好'}
+
+
+def test_chunked_event_stream_is_read_line_by_line(server):
+    response = HTTPClientTransport().post_json(f'{server.url}/sse', {}, stream=True)
+
+    with response:
+        lines = list(response.iter_lines())
+
+    assert lines == ['data: one', '', 'data: two', '', 'data: [DONE]']
+
+
+def test_stream_releases_the_connection_once_read(server):
+    transport = HTTPClientTransport()
+
+    with transport.post_json(f'{server.url}/sse', {}, stream=True) as response:
+        list(response.iter_lines())
+    transport.post_json(f'{server.url}/echo', {})
+
+    (_, first), (_, second) = server.requests
+    assert first == second
+
+
+@pytest.mark.parametrize('status', [400, 429, 500, 503])
+def test_error_status_raises_transport_error(server, status):
+    with pytest.raises(TransportError) as error:
+        HTTPClientTransport().post_json(f'{server.url}/status/{status}', {})
+
+    assert error.value.status == status
+
+
+def test_connection_refused_raises_transport_error(server):
+    url = server.url
+    server.shutdown()
+    server.server_close()
+
+    with pytest.raises(TransportError) as error:
+        HTTPClientTransport().post_json(f'{url}/echo', {}, timeout=1)
+
+    assert error.value.status is None
+
+
+@pytest.fixture
+def no_proxy_env(monkeypatch):
+    for name in list(os.environ):
+        if name.lower().endswith('_proxy'):
+            monkeypatch.delenv(name)
+
+
+def test_requests_needed_follows_proxy_settings(no_proxy_env, monkeypatch):
+    assert not requests_needed()
+
+    monkeypatch.setenv('NO_PROXY', 'localhost')
+    assert not requests_needed()
+
+    monkeypatch.setenv('https_proxy', 'http://proxy:3128')
+    assert requests_needed()
+
+
+def test_auto_uses_stdlib_without_proxy(no_proxy_env):
+    assert resolve_transport_name('auto') == 'stdlib'
+    with pytest.raises(ValueError):
+        resolve_transport_name('curl')
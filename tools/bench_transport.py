@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Compare the startup cost of the hooks with each HTTP transport.
+
+For every hook and transport ('stdlib' and 'requests') this measures, in
+fresh subprocesses:
+
+- import: time to import the hook module and create the transport, and the
+  peak RSS of a process that does only that
+- run: end-to-end latency, CPU time and peak RSS of the hook against the
+  load test's mock provider (see tools/loadtest.py)
+
+Usage:
+    python tools/bench_transport.py [--runs 10] [--hooks input,output,stop] [--json report.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'tools'))
+
+from lib.paths import CONFIG_ENV, DATA_DIR_ENV, HEADLESS_ENV
+from loadtest import (HOOKS, SAMPLE_PROMPTS, MockSettings, load_transcripts, run_hook,
+                      start_mock_server, write_config)
+
+TRANSPORTS = ('stdlib', 'requests')
+
+IMPORT_PROBE = """
+import json, sys, time
+sys.path[:0] = [{root!r}, {hooks_dir!r}]
+started = time.perf_counter()
+import {module}
+from lib.transport import get_transport
+get_transport({transport!r})
+elapsed = time.perf_counter() - started
+print(json.dumps({{'import_ms': elapsed * 1000, 'requests_loaded': 'requests' in sys.modules}}))
+"""
+
+
+def measure_import(hook: str, transport: str, env: dict) -> dict:
+    """Import one hook in a fresh interpreter and measure time and peak RSS."""
+    module = os.path.splitext(os.path.basename(HOOKS[hook]))[0]
+    probe = IMPORT_PROBE.format(root=PROJECT_ROOT, hooks_dir=os.path.dirname(HOOKS[hook]),
+                                module=module, transport=transport)
+    proc = subprocess.Popen([sys.executable, '-c', probe], stdout=subprocess.PIPE, env=env)
+    output = proc.stdout.read()
+    proc.stdout.close()
+    rss = None
+    if hasattr(os, 'wait4'):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        rss = usage.ru_maxrss / 1024 if sys.platform != 'darwin' else usage.ru_maxrss / 1024 / 1024
+    else:
+        proc.wait()
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import probe for {hook} with {transport} failed")
+    result = json.loads(output)
+    result['rss_mb'] = rss
+    return result
+
+
+def median(values: list):
+    values = [v for v in values if v is not None]
+    return statistics.median(values) if values else None
+
+
+def bench(hook: str, transport: str, args, base_url: str, transcripts: list, work_dir: str) -> dict:
+    run_dir = os.path.join(work_dir, f'{hook}-{transport}')
+    os.makedirs(run_dir)
+    config_file = os.path.join(run_dir, 'config.json')
+    args.transport = transport
+    write_config(config_file, args, base_url)
+
+    env = dict(os.environ)
+    env[CONFIG_ENV] = config_file
+    env[DATA_DIR_ENV] = os.path.join(run_dir, 'data')
+    env[HEADLESS_ENV] = '1'
+
+    imports = [measure_import(hook, transport, env) for _ in range(args.runs)]
+    runs = []
+    for i in range(args.runs):
+        if hook == 'input':
+            payload = {'hook_event_name': 'UserPromptSubmit', 'prompt': SAMPLE_PROMPTS[i % len(SAMPLE_PROMPTS)]}
+        elif hook == 'output':
+            payload = {'hook_event_name': 'Notification', 'notification_type': 'idle_prompt',
+                       'transcript_path': transcripts[i % len(transcripts)]}
+        else:
+            payload = {'hook_event_name': 'Stop', 'stop_hook_active': False,
+                       'transcript_path': transcripts[i % len(transcripts)]}
+        runs.append(run_hook(hook, payload, env, run_dir))
+
+    return {
+        'hook': hook,
+        'transport': transport,
+        'import_ms': median([r['import_ms'] for r in imports]),
+        'import_rss_mb': median([r['rss_mb'] for r in imports]),
+        'requests_loaded': any(r['requests_loaded'] for r in imports),
+        'run_ms': median([r['latency'] * 1000 for r in runs]),
+        'run_cpu_ms': median([r['cpu'] * 1000 if r['cpu'] is not None else None for r in runs]),
+        'run_rss_mb': median([r['rss_mb'] for r in runs]),
+        'errors': sum(1 for r in runs if not r['ok']),
+    }
+
+
+def fmt(value, spec: str) -> str:
+    return format(value, spec) if value is not None else 'n/a'
+
+
+def print_report(results: list):
+    header = (f"{'hook':>6} {'transport':>9} {'import ms':>9} {'import MB':>9} {'requests':>8} "
+              f"{'run ms':>7} {'cpu ms':>7} {'run MB':>7} {'errors':>6}")
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['hook']:>6} {r['transport']:>9} {fmt(r['import_ms'], '9.1f')} {fmt(r['import_rss_mb'], '9.1f')} "
+              f"{'yes' if r['requests_loaded'] else 'no':>8} {fmt(r['run_ms'], '7.1f')} "
+              f"{fmt(r['run_cpu_ms'], '7.1f')} {fmt(r['run_rss_mb'], '7.1f')} {r['errors']:>6}")
+
+    print("\nSaved by the stdlib transport (median, requests minus stdlib)")
+    by_key = {(r['hook'], r['transport']): r for r in results}
+    for hook in dict.fromkeys(r['hook'] for r in results):
+        stdlib, requests_ = by_key.get((hook, 'stdlib')), by_key.get((hook, 'requests'))
+        if not stdlib or not requests_:
+            continue
+        deltas = {name: (requests_[name] - stdlib[name]) if None not in (requests_[name], stdlib[name]) else None
+                  for name in ('import_ms', 'import_rss_mb', 'run_ms', 'run_rss_mb')}
+        print(f"  {hook:<7} import {fmt(deltas['import_ms'], '.1f')} ms, {fmt(deltas['import_rss_mb'], '.1f')} MB; "
+              f"run {fmt(deltas['run_ms'], '.1f')} ms, {fmt(deltas['run_rss_mb'], '.1f')} MB")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark hook startup with each HTTP transport.")
+    parser.add_argument('--runs', type=int, default=10, help="Subprocesses per hook, transport and measurement")
+    parser.add_argument('--hooks', default='input,output,stop', help="Hooks to measure")
+    parser.add_argument('--provider', default='qianwen', choices=['qianwen', 'baidu'])
+    parser.add_argument('--latency', type=float, default=0.0, help="Mock provider latency in seconds")
+    parser.add_argument('--json', help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+    hooks = [hook.strip() for hook in args.hooks.split(',')]
+
+    # Settings read by loadtest.write_config()
+    args.baidu_qps = 10
+    args.cache = False
+    args.budget = 50
+
+    settings = MockSettings(args.latency, 0.0, 0.0, 0)
+    server = start_mock_server(settings)
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    work_dir = tempfile.mkdtemp(prefix='translator-bench-')
+    try:
+        transcripts = load_transcripts(None, work_dir)
+        results = [bench(hook, transport, args, base_url, transcripts, work_dir)
+                   for hook in hooks for transport in TRANSPORTS]
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
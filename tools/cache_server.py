@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Shared team translation cache service.
+
+A small HTTP service holding translations keyed by the hooks' cache keys
+(hash of normalized text, target language, provider and model), backed by
+the same SQLite store as the local cache. Point every machine's
+config.json at it:
+
+    "shared_cache": { "url": "http://cache-host:8765", "timeout": 0.3, "token": "..." }
+
+Usage:
+    python tools/cache_server.py [--host 127.0.0.1] [--port 8765] [--db PATH] [--token TOKEN]
+
+Endpoints:
+    POST /mget  {"keys": [...]}                                   -> {"items": {key: translation}}
+    POST /mput  {"items": {key: {"source": ..., "translation": ...}}} -> {"stored": n}
+    GET  /health                                                   -> {"status": "ok"}
+"""
+
+import argparse
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.cache import TranslationCache
+from lib.paths import data_path
+
+# Upper bound on keys or items accepted in one request
+MAX_BATCH = 1000
+
+
+def make_handler(cache: TranslationCache, token: str = None):
+    """Build the request handler bound to a cache store."""
+
+    class CacheHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _authorized(self) -> bool:
+            return not token or self.headers.get('Authorization') == f'Bearer {token}'
+
+        def do_GET(self):
+            if self.path == '/health':
+                return self._send_json(200, {'status': 'ok'})
+            self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if not self._authorized():
+                return self._send_json(401, {'error': 'unauthorized'})
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            except ValueError:
+                return self._send_json(400, {'error': 'invalid JSON'})
+
+            if self.path == '/mget':
+                keys = payload.get('keys', [])[:MAX_BATCH]
+                return self._send_json(200, {'items': cache.get_many(keys)})
+
+            if self.path == '/mput':
+                items = list(payload.get('items', {}).items())[:MAX_BATCH]
+                cache.put_many({
+                    key: (item.get('source'), item['translation'])
+                    for key, item in items
+                    if isinstance(item, dict) and item.get('translation')
+                })
+                return self._send_json(200, {'stored': len(items)})
+
+            self._send_json(404, {'error': 'not found'})
+
+    return CacheHandler
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Run the shared translation cache service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--db', default=None, help="SQLite path (defaults to data/shared_cache.sqlite3)")
+    parser.add_argument('--token', default=None, help="Require this bearer token")
+    args = parser.parse_args()
+
+    cache = TranslationCache(args.db or data_path('shared_cache.sqlite3'))
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(cache, args.token))
+    print(f"Shared translation cache listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
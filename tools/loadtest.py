@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""Concurrent multi-session load test for the translation hooks.
+
+Replays prompts and transcript files through hooks/translate_input.py,
+hooks/translate_output.py and hooks/translate_stop.py as real subprocesses, the way Claude Code runs
+them, against a local mock Qianwen/Baidu server. Dialogs are disabled with
+CLAUDE_TRANSLATOR_HEADLESS=1 and every concurrency level gets its own config
+and data directory.
+
+Usage:
+    python tools/loadtest.py --concurrency 1,20,50 --requests 100
+    python tools/loadtest.py --provider baidu --latency 0.3 --error-rate 0.05 --rate-limit 20
+    python tools/loadtest.py --prompts prompts.txt --transcripts ./transcripts --json report.json
+
+The prompts file holds one prompt per section, sections separated by a line
+containing only '---'. The transcripts directory holds Claude Code *.jsonl
+transcripts.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.paths import CONFIG_ENV, DATA_DIR_ENV, HEADLESS_ENV
+
+HOOKS = {
+    'input': os.path.join(PROJECT_ROOT, 'hooks', 'translate_input.py'),
+    'output': os.path.join(PROJECT_ROOT, 'hooks', 'translate_output.py'),
+    'stop': os.path.join(PROJECT_ROOT, 'hooks', 'translate_stop.py'),
+}
+
+SEGMENT_RE = re.compile(r'^\[(\d+)\]\s?(.*)$')
+
+SAMPLE_PROMPTS = [
+    "请帮我修复登录页面的空指针异常",
+    "解释一下这段代码的作用，并给出优化建议：\n```python\ndef f(xs):\n    return [x * 2 for x in xs]\n```",
+    "运行测试",
+    "把 utils.py 里的日期解析函数改成支持时区，然后补充单元测试",
+    "这个报错是什么意思？\nTraceback (most recent call last):\n  File \"app.py\", line 3, in <module>\n    main()\nKeyError: 'user'",
+]
+
+SAMPLE_ANSWERS = [
+    "I fixed the null check in `LoginForm.submit()`.\n\n## Changes\n- Added a guard for missing users\n- Updated the tests\n\nAll tests pass.",
+    "This function doubles every element of the list.\n\n| Input | Output |\n| --- | --- |\n| [1, 2] | [2, 4] |\n\nYou could use a generator if the list is large.",
+    "## Summary of changes\n\n```python\ndef parse(value, tz=None):\n    ...\n```\n\nThe parser now accepts an optional time zone.\n\n1. Added `tz` parameter\n2. Added three tests",
+]
+
+
+class MockSettings:
+    """Fault injection settings shared by all mock server threads."""
+
+    def __init__(self, latency: float, jitter: float, error_rate: float, rate_limit: float):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.lock = threading.Lock()
+        self.window = []
+        self.counts = {'requests': 0, 'errors': 0, 'rate_limited': 0}
+
+    def count(self, name: str):
+        with self.lock:
+            self.counts[name] += 1
+
+    def over_rate_limit(self) -> bool:
+        """Sliding one-second window over all providers."""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            self.window = [t for t in self.window if now - t < 1.0]
+            if len(self.window) >= self.rate_limit:
+                return True
+            self.window.append(now)
+            return False
+
+
+def mock_translate(text: str) -> str:
+    """Fake translation that keeps line structure and segment numbers."""
+    lines = []
+    for line in text.split('\n'):
+        match = SEGMENT_RE.match(line)
+        if match:
+            lines.append(f"[{match.group(1)}] 译:{match.group(2)}")
+        else:
+            lines.append(f"译:{line}" if line.strip() else line)
+    return '\n'.join(lines)
+
+
+def make_handler(settings: MockSettings):
+    """Build a request handler serving /qianwen/... and /baidu/... endpoints."""
+
+    class MockProviderHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            settings.count('requests')
+            time.sleep(max(0.0, settings.latency + random.uniform(-settings.jitter, settings.jitter)))
+
+            qianwen = self.path.startswith('/qianwen')
+            if settings.over_rate_limit():
+                settings.count('rate_limited')
+                if qianwen:
+                    return self._send_json(429, {'error': {'message': 'Requests rate limit exceeded'}})
+                return self._send_json(200, {'error_code': 54003, 'error_msg': 'Invalid Access Limit'})
+            if random.random() < settings.error_rate:
+                settings.count('errors')
+                if qianwen:
+                    return self._send_json(500, {'error': {'message': 'Injected error'}})
+                return self._send_json(200, {'error_code': 52001, 'error_msg': 'TIMEOUT'})
+
+            if qianwen:
+                return self._qianwen(payload)
+            lines = [line for line in payload.get('q', '').split('\n') if line.strip()]
+            self._send_json(200, {
+                'from': 'auto', 'to': payload.get('to'),
+                'trans_result': [{'src': line, 'dst': mock_translate(line)} for line in lines]
+            })
+
+        def _qianwen(self, payload: dict):
+            text = payload['messages'][-1]['content']
+            translated = mock_translate(text)
+            usage = {'prompt_tokens': len(text), 'completion_tokens': len(translated),
+                     'total_tokens': len(text) + len(translated)}
+            if not payload.get('stream'):
+                return self._send_json(200, {'choices': [{'message': {'content': translated}}], 'usage': usage})
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for piece in re.findall(r'\S+\s*|\s+', translated):
+                self._chunk(f"data: {json.dumps({'choices': [{'delta': {'content': piece}}]}, ensure_ascii=False)}\n\n")
+            self._chunk("data: [DONE]\n\n")
+            self.wfile.write(b'0\r\n\r\n')
+
+        def _chunk(self, text: str):
+            data = text.encode('utf-8')
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+    return MockProviderHandler
+
+
+def start_mock_server(settings: MockSettings) -> ThreadingHTTPServer:
+    """Start the mock provider server on a free local port."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(settings))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_prompts(path: str) -> list:
+    if not path:
+        return SAMPLE_PROMPTS
+    with open(path, 'r', encoding='utf-8') as f:
+        sections = re.split(r'^---\s*$', f.read(), flags=re.MULTILINE)
+    return [section.strip() for section in sections if section.strip()]
+
+
+def load_transcripts(path: str, work_dir: str) -> list:
+    if path:
+        return sorted(
+            os.path.join(path, name) for name in os.listdir(path) if name.endswith('.jsonl')
+        )
+    # Synthetic transcripts: a user turn followed by an assistant message
+    transcripts = []
+    for i, answer in enumerate(SAMPLE_ANSWERS):
+        transcript = os.path.join(work_dir, f'transcript_{i}.jsonl')
+        with open(transcript, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'type': 'user', 'message': {'role': 'user', 'content': SAMPLE_PROMPTS[i]}},
+                               ensure_ascii=False) + '\n')
+            f.write(json.dumps({'type': 'assistant', 'message': {
+                'id': f'msg_{i}', 'role': 'assistant', 'type': 'message',
+                'content': [{'type': 'text', 'text': answer}]
+            }}, ensure_ascii=False) + '\n')
+        transcripts.append(transcript)
+    return transcripts
+
+
+def write_config(path: str, args, base_url: str):
+    config = {
+        'provider': args.provider,
+        'qianwen': {'base_url': f'{base_url}/qianwen/v1', 'model': 'mock', 'api_key': 'mock'},
+        'baidu': {'base_url': f'{base_url}/baidu/ait', 'api_key': 'mock', 'app_id': 'mock',
+                  'qps': args.baidu_qps},
+        'translate_output': True,
+        'interactive_input': True,
+        'interactive_output': True,
+        'cache': args.cache,
+        'transport': args.transport,
+        'budget': {'input_seconds': args.budget, 'output_seconds': args.budget},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+
+def run_hook(hook: str, payload: dict, env: dict, work_dir: str) -> dict:
+    """Run one hook subprocess and measure latency, CPU time and peak RSS."""
+    with tempfile.TemporaryFile(dir=work_dir) as out, tempfile.TemporaryFile(dir=work_dir) as err:
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, HOOKS[hook]], stdin=subprocess.PIPE,
+                                stdout=out, stderr=err, env=env)
+        proc.stdin.write(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        proc.stdin.close()
+
+        cpu = rss = None
+        if hasattr(os, 'wait4'):
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            cpu = usage.ru_utime + usage.ru_stime
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            rss = usage.ru_maxrss / 1024 if sys.platform != 'darwin' else usage.ru_maxrss / 1024 / 1024
+        else:
+            proc.wait()
+        latency = time.perf_counter() - started
+
+        err.seek(0)
+        stderr = err.read().decode('utf-8', 'replace')
+    return {
+        'hook': hook,
+        'latency': latency,
+        'cpu': cpu,
+        'rss_mb': rss,
+        'ok': proc.returncode == 0 and 'error' not in stderr.lower(),
+    }
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(results: list, wall: float) -> dict:
+    summary = {}
+    for hook in HOOKS:
+        runs = [r for r in results if r['hook'] == hook]
+        if not runs:
+            continue
+        latencies = [r['latency'] for r in runs]
+        cpus = [r['cpu'] for r in runs if r['cpu'] is not None]
+        rss = [r['rss_mb'] for r in runs if r['rss_mb'] is not None]
+        summary[hook] = {
+            'runs': len(runs),
+            'throughput': len(runs) / wall if wall else 0.0,
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'p99': percentile(latencies, 99),
+            'max': max(latencies),
+            'cpu_ms': sum(cpus) / len(cpus) * 1000 if cpus else None,
+            'rss_mb': max(rss) if rss else None,
+            'error_rate': sum(1 for r in runs if not r['ok']) / len(runs),
+        }
+    return summary
+
+
+def run_level(concurrency: int, args, prompts: list, transcripts: list, base_url: str, work_dir: str) -> dict:
+    level_dir = os.path.join(work_dir, f'c{concurrency}')
+    os.makedirs(level_dir)
+    config_file = os.path.join(level_dir, 'config.json')
+    write_config(config_file, args, base_url)
+
+    env = dict(os.environ)
+    env[CONFIG_ENV] = config_file
+    env[DATA_DIR_ENV] = os.path.join(level_dir, 'data')
+    env[HEADLESS_ENV] = '1'
+
+    tasks = []
+    for i in range(args.requests):
+        if 'input' in args.hooks:
+            tasks.append(('input', {'hook_event_name': 'UserPromptSubmit', 'session_id': f's{i % concurrency}',
+                                    'prompt': prompts[i % len(prompts)]}))
+        if 'output' in args.hooks and transcripts:
+            tasks.append(('output', {'hook_event_name': 'Notification', 'session_id': f's{i % concurrency}',
+                                     'notification_type': 'idle_prompt',
+                                     'transcript_path': transcripts[i % len(transcripts)]}))
+        if 'stop' in args.hooks and transcripts:
+            tasks.append(('stop', {'hook_event_name': 'Stop', 'session_id': f's{i % concurrency}',
+                                   'stop_hook_active': False,
+                                   'transcript_path': transcripts[i % len(transcripts)]}))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda task: run_hook(task[0], task[1], env, level_dir), tasks))
+    wall = time.perf_counter() - started
+    return {'concurrency': concurrency, 'wall': wall, 'hooks': summarize(results, wall)}
+
+
+def print_report(levels: list, server_counts: dict):
+    header = f"{'conc':>5} {'hook':>6} {'runs':>5} {'rps':>7} {'p50':>7} {'p90':>7} {'p99':>7} {'max':>7} {'cpu ms':>7} {'rss MB':>7} {'err %':>6}"
+    print(header)
+    print('-' * len(header))
+    for level in levels:
+        for hook, s in level['hooks'].items():
+            cpu = f"{s['cpu_ms']:7.0f}" if s['cpu_ms'] is not None else f"{'n/a':>7}"
+            rss = f"{s['rss_mb']:7.1f}" if s['rss_mb'] is not None else f"{'n/a':>7}"
+            print(f"{level['concurrency']:>5} {hook:>6} {s['runs']:>5} {s['throughput']:7.2f} "
+                  f"{s['p50']:7.3f} {s['p90']:7.3f} {s['p99']:7.3f} {s['max']:7.3f} {cpu} {rss} "
+                  f"{s['error_rate'] * 100:6.1f}")
+    print(f"\nMock provider: {server_counts['requests']} requests, {server_counts['errors']} injected errors, "
+          f"{server_counts['rate_limited']} rate limited")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Load-test the translation hooks with mock providers.")
+    parser.add_argument('--concurrency', default='1,20,50', help="Comma-separated concurrency levels")
+    parser.add_argument('--requests', type=int, default=50, help="Hook invocations per hook and level")
+    parser.add_argument('--hooks', default='input,output', help="Hooks to exercise (input, output, stop)")
+    parser.add_argument('--provider', default='qianwen', choices=['qianwen', 'baidu'])
+    parser.add_argument('--prompts', help="Prompt corpus file (sections separated by '---')")
+    parser.add_argument('--transcripts', help="Directory of transcript *.jsonl files")
+    parser.add_argument('--latency', type=float, default=0.2, help="Mock provider latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.05, help="Random latency jitter in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests failing")
+    parser.add_argument('--rate-limit', type=float, default=0, help="Requests per second before 429s (0: off)")
+    parser.add_argument('--baidu-qps', type=float, default=10, help="qps setting given to the Baidu client")
+    parser.add_argument('--budget', type=float, default=50, help="Hook time budget in seconds")
+    parser.add_argument('--cache', action='store_true', help="Enable the translation cache")
+    parser.add_argument('--transport', default='auto', choices=['auto', 'stdlib', 'requests'],
+                        help="HTTP transport used by the hooks")
+    parser.add_argument('--json', help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+    args.hooks = [hook.strip() for hook in args.hooks.split(',')]
+
+    settings = MockSettings(args.latency, args.jitter, args.error_rate, args.rate_limit)
+    server = start_mock_server(settings)
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    work_dir = tempfile.mkdtemp(prefix='translator-loadtest-')
+    try:
+        prompts = load_prompts(args.prompts)
+        transcripts = load_transcripts(args.transcripts, work_dir)
+        levels = []
+        for concurrency in (int(c) for c in args.concurrency.split(',')):
+            levels.append(run_level(concurrency, args, prompts, transcripts, base_url, work_dir))
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_report(levels, settings.counts)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'levels': levels, 'mock_provider': settings.counts}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Build and grow the offline phrasebook.
+
+Usage:
+    python tools/phrasebook.py build
+    python tools/phrasebook.py add "Source phrase {file}" "译文 {file}" --lang Chinese
+    python tools/phrasebook.py grow [--min-hits 3] [--max-chars 80] [--dry-run]
+
+'grow' promotes short translations that were served from the translation
+cache at least --min-hits times, i.e. phrases that keep recurring in real
+traffic, into phrasebook.json.
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.cache import TranslationCache
+from lib.markdown import CJK_RE
+from lib.phrasebook import build, escape_phrase, load_phrases, normalize_phrase, save_phrases, validate_source
+
+
+def add_phrase(phrases: dict, source: str, target: str, target_lang: str) -> bool:
+    """Add a phrase unless the same source already exists.
+
+    Returns:
+        True if the phrase was added
+
+    Raises:
+        ValueError: If the source has an invalid or repeated slot
+    """
+    normalized = normalize_phrase(source)
+    problem = validate_source(normalized)
+    if problem:
+        raise ValueError(problem)
+    entries = phrases.setdefault(target_lang, [])
+    if any(normalize_phrase(entry['source']) == normalized for entry in entries):
+        return False
+    entries.append({'source': source, 'target': target})
+    return True
+
+
+def cmd_build(args):
+    for lang, entries in load_phrases().items():
+        for entry in entries:
+            problem = validate_source(normalize_phrase(entry['source']))
+            if problem:
+                print(f"Skipped {lang} entry {entry['source']!r}: {problem}", file=sys.stderr)
+    compiled = build()
+    for lang, table in compiled.items():
+        print(f"{lang}: {len(table['exact'])} phrases, {len(table['templates'])} templates")
+
+
+def cmd_add(args):
+    phrases = load_phrases()
+    try:
+        added = add_phrase(phrases, args.source, args.target, args.lang)
+    except ValueError as e:
+        print(f"Invalid phrase: {e}", file=sys.stderr)
+        sys.exit(1)
+    if added:
+        save_phrases(phrases)
+        build()
+        print(f"Added: {args.source} -> {args.target}")
+    else:
+        print(f"Already in phrasebook: {args.source}")
+
+
+def cmd_grow(args):
+    phrases = load_phrases()
+    added = 0
+    for source, translation, hits in TranslationCache().frequent(args.min_hits, args.max_chars):
+        # Multi-line texts are prompts or answers, not phrases
+        if '\n' in source.strip() or '\n' in translation.strip():
+            continue
+        target_lang = 'English' if CJK_RE.search(source) else 'Chinese'
+        # Cached texts are literal; braces in them are not slots
+        if add_phrase(phrases, escape_phrase(source.strip()), escape_phrase(translation.strip()), target_lang):
+            added += 1
+            print(f"[{hits} hits] {source.strip()} -> {translation.strip()}")
+
+    if args.dry_run:
+        print(f"\n{added} phrases would be added (dry run)")
+        return
+    if added:
+        save_phrases(phrases)
+        build()
+    print(f"\n{added} phrases added")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Build and grow the offline phrasebook.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('build', help="Compile phrasebook.json").set_defaults(func=cmd_build)
+
+    add_parser = subparsers.add_parser('add', help="Add a phrase or {slot} template")
+    add_parser.add_argument('source')
+    add_parser.add_argument('target')
+    add_parser.add_argument('--lang', default='Chinese', choices=['Chinese', 'English'],
+                            help="Target language of the translation")
+    add_parser.set_defaults(func=cmd_add)
+
+    grow_parser = subparsers.add_parser('grow', help="Add frequently cached phrases")
+    grow_parser.add_argument('--min-hits', type=int, default=3)
+    grow_parser.add_argument('--max-chars', type=int, default=80)
+    grow_parser.add_argument('--dry-run', action='store_true')
+    grow_parser.set_defaults(func=cmd_grow)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
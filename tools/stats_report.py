@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Summarize data/stats.jsonl.
+
+Usage:
+    python tools/stats_report.py [--path data/stats.jsonl]
+
+Prints hook outcomes with latency percentiles (to tune the time budgets),
+per-tier latency and usage, the tokens each injection format would add
+to Claude's prompt, and how often each confirm policy decision was
+accepted, edited or cancelled.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.paths import data_path
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def load_events(path: str) -> list:
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return events
+
+
+def report_outcomes(events: list):
+    print("Hook outcomes")
+    for hook in ('input', 'output', 'stop'):
+        by_outcome = defaultdict(list)
+        for event in events:
+            if event['event'] == hook:
+                by_outcome[event.get('outcome')].append(event.get('elapsed') or 0.0)
+        for outcome, elapsed in sorted(by_outcome.items(), key=lambda item: str(item[0])):
+            print(f"  {hook:<7} {str(outcome):<12} n={len(elapsed):<6} "
+                  f"p50={percentile(elapsed, 50):.3f}s p90={percentile(elapsed, 90):.3f}s "
+                  f"max={max(elapsed):.3f}s")
+
+
+def report_tiers(events: list):
+    by_model = defaultdict(list)
+    for event in events:
+        if event['event'] == 'tier':
+            by_model[(event.get('tier'), event.get('model'))].append(event)
+    if not by_model:
+        return
+    print("\nModel tiers")
+    for (tier, model), tier_events in sorted(by_model.items(), key=lambda item: str(item[0])):
+        latencies = [e['latency'] for e in tier_events]
+        tokens = sum((e.get('usage') or {}).get('total_tokens', 0) for e in tier_events)
+        print(f"  tier={tier} {model:<16} n={len(tier_events):<6} p50={percentile(latencies, 50):.3f}s "
+              f"p90={percentile(latencies, 90):.3f}s total_tokens={tokens}")
+
+
+def report_injection(events: list):
+    injections = [e for e in events if e['event'] == 'injection']
+    if not injections:
+        return
+    print("\nInjection formats (average tokens added per prompt)")
+    skipped = sum(1 for e in injections if e.get('format') == 'skip')
+    measured = [e for e in injections if e.get('added_tokens')]
+    prompt_tokens = sum(e.get('prompt_tokens', 0) for e in measured)
+    print(f"  prompts={len(injections)} skipped_as_code={skipped}")
+    if measured:
+        print(f"  original prompt: {prompt_tokens / len(measured):.1f}")
+        for fmt in measured[0]['added_tokens']:
+            added = sum(e['added_tokens'].get(fmt, 0) for e in measured)
+            print(f"  {fmt:<8} +{added / len(measured):.1f}")
+
+
+def report_confirm(events: list):
+    decisions = [e for e in events if e['event'] == 'confirm']
+    if not decisions:
+        return
+    print("\nConfirm policy (results per action and reason)")
+    by_action = defaultdict(lambda: defaultdict(int))
+    for event in decisions:
+        by_action[(event.get('action'), event.get('reason'))][event.get('result')] += 1
+    for (action, reason), results in sorted(by_action.items(), key=lambda item: str(item[0])):
+        total = sum(results.values())
+        shares = ' '.join(f"{result}={count / total:.0%}" for result, count in sorted(results.items()))
+        print(f"  {str(action):<10} {str(reason):<24} n={total:<6} {shares}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Summarize translation hook statistics.")
+    parser.add_argument('--path', default=None, help="Stats file (defaults to data/stats.jsonl)")
+    args = parser.parse_args()
+
+    path = args.path or data_path('stats.jsonl')
+    if not os.path.exists(path):
+        print(f"No statistics recorded yet: {path}")
+        return
+
+    events = load_events(path)
+    report_outcomes(events)
+    report_tiers(events)
+    report_injection(events)
+    report_confirm(events)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Translate a whole Claude Code session into an aligned bilingual file.
+
+The transcript is streamed twice: once to collect the distinct user and
+assistant text blocks, once to write the output. Blocks are translated in
+batches across a worker pool, optionally rate limited, using the configured
+providers, cache and phrasebook. Every finished batch is appended to a
+progress file next to the output, so an interrupted run picks up where it
+stopped without translating anything twice; blocks that could not be
+translated are not recorded, so they are retried. The progress file is
+removed once every block is translated and the output is written.
+
+Usage:
+    python tools/translate_transcript.py SESSION.jsonl [-o OUTPUT] [--format markdown|jsonl]
+        [--target auto|Chinese|English] [--batch-size 50] [--workers 4] [--qps 0] [--restart]
+
+With --target auto (the default) every block goes to the other language:
+Chinese prompts to English and English answers to Chinese.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.output import is_mostly_chinese
+from lib.paths import config_path
+from lib.phrasebook import Phrasebook
+from lib.providers import get_translation_client
+from lib.ratelimit import RateLimiter
+from lib.shared_cache import open_cache
+from lib.transcript import iter_messages
+from lib.translation import client_cache_key, translate_blocks
+
+ROLE_TITLES = {'user': 'User', 'assistant': 'Assistant'}
+
+
+def load_config():
+    """Load configuration from config.json."""
+    with open(config_path(), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class RateLimitedTransport:
+    """Transport wrapper starting at most `qps` provider requests per second."""
+
+    def __init__(self, transport, limiter: RateLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    def __getattr__(self, name):
+        return getattr(self.transport, name)
+
+    def post_json(self, *args, **kwargs):
+        self.limiter.acquire()
+        return self.transport.post_json(*args, **kwargs)
+
+
+def limit_rate(client, qps: float):
+    """Rate limit every HTTP request of a client and its fallback providers.
+
+    Limiting at the transport also covers the requests a client makes on
+    its own, e.g. retrying segments missing from a batch one by one.
+    """
+    limiter = RateLimiter(qps)
+    for provider_client in getattr(client, 'clients', [client]):
+        provider_client.transport = RateLimitedTransport(provider_client.transport, limiter)
+
+
+def block_target(client, text: str, target: str):
+    """Target language of one block, or None if it needs no translation."""
+    if target == 'auto':
+        return 'English' if client.detect_non_english(text) else 'Chinese'
+    if target == 'Chinese':
+        return None if is_mostly_chinese(text) else 'Chinese'
+    return 'English' if client.detect_non_english(text) else None
+
+
+def load_progress(path: str) -> dict:
+    """Read the translations recorded by earlier runs."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write leaves a truncated last line
+                continue
+            done[entry['key']] = entry['translation']
+    return done
+
+
+def append_progress(path: str, translations: dict):
+    """Durably record a finished batch."""
+    with open(path, 'a', encoding='utf-8') as f:
+        for key, translation in translations.items():
+            f.write(json.dumps({'key': key, 'translation': translation}, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def collect_blocks(transcript: str, client, target: str) -> dict:
+    """Distinct blocks needing translation, as key -> (text, target language)."""
+    pending = {}
+    for _, _, blocks in iter_messages(transcript):
+        for block in blocks:
+            lang = block_target(client, block, target)
+            if lang:
+                pending.setdefault(client_cache_key(client, block, lang), (block, lang))
+    return pending
+
+
+def translate_all(client, pending: dict, done: dict, progress_path: str, args, config: dict):
+    """Translate the missing blocks batch by batch, recording each batch."""
+    cache = open_cache(config)
+    phrasebook = Phrasebook.load() if config.get('phrasebook', True) else None
+    todo = [key for key in pending if key not in done]
+    total = len(pending)
+    print(f"{total} distinct blocks, {total - len(todo)} already translated", file=sys.stderr)
+
+    started = time.monotonic()
+    for lang in ('English', 'Chinese'):
+        keys = [key for key in todo if pending[key][1] == lang]
+        for start in range(0, len(keys), args.batch_size):
+            batch = keys[start:start + args.batch_size]
+            result = translate_blocks(
+                client, [pending[key][0] for key in batch], lang, cache,
+                max_workers=args.workers,
+                # Markdown segmentation skips Chinese prose, so it only suits answers
+                markdown_aware=lang == 'Chinese' and config.get('markdown_output', True),
+                phrasebook=phrasebook
+            )
+            # Blocks that kept their original text are retried by the next run
+            translations = {key: text for key, text, ok in zip(batch, result.blocks, result.translated) if ok}
+            append_progress(progress_path, translations)
+            done.update(translations)
+            print(f"  {len(done)}/{total} blocks ({time.monotonic() - started:.1f}s)", file=sys.stderr)
+
+
+def write_output(transcript: str, client, target: str, done: dict, path: str, fmt: str):
+    """Write the bilingual file, aligned message by message and block by block."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for index, (role, message_id, blocks) in enumerate(iter_messages(transcript), 1):
+            if fmt == 'markdown':
+                f.write(f"## {index}. {ROLE_TITLES[role]}\n\n")
+            for block in blocks:
+                lang = block_target(client, block, target)
+                translation = done.get(client_cache_key(client, block, lang)) if lang else None
+                if fmt == 'jsonl':
+                    f.write(json.dumps({'index': index, 'role': role, 'message_id': message_id,
+                                        'source': block, 'translation': translation}, ensure_ascii=False) + '\n')
+                    continue
+                f.write(f"{block}\n\n")
+                if translation is not None:
+                    quoted = '\n'.join(f"> {line}" if line else '>' for line in translation.split('\n'))
+                    f.write(f"{quoted}\n\n")
+            if fmt == 'markdown':
+                f.write("---\n\n")
+    os.replace(tmp_path, path)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Translate a Claude Code transcript into a bilingual file.")
+    parser.add_argument('transcript', help="Transcript *.jsonl file")
+    parser.add_argument('-o', '--output', help="Output file (default: <transcript>.bilingual.md/.jsonl)")
+    parser.add_argument('--format', choices=['markdown', 'jsonl'], default='markdown')
+    parser.add_argument('--target', choices=['auto', 'Chinese', 'English'], default='auto')
+    parser.add_argument('--batch-size', type=int, default=50, help="Blocks per checkpointed batch")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent provider requests")
+    parser.add_argument('--qps', type=float, default=0, help="Provider requests per second (0: no limit)")
+    parser.add_argument('--restart', action='store_true', help="Ignore the progress of an earlier run")
+    args = parser.parse_args()
+
+    extension = 'md' if args.format == 'markdown' else 'jsonl'
+    output = args.output or f"{os.path.splitext(args.transcript)[0]}.bilingual.{extension}"
+    progress_path = f"{output}.progress.jsonl"
+    if args.restart and os.path.exists(progress_path):
+        os.remove(progress_path)
+
+    config = load_config()
+    client = get_translation_client(config)
+    if args.qps:
+        limit_rate(client, args.qps)
+
+    pending = collect_blocks(args.transcript, client, args.target)
+    done = {key: value for key, value in load_progress(progress_path).items() if key in pending}
+    try:
+        translate_all(client, pending, done, progress_path, args, config)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; {len(done)} blocks saved. Run the same command again to resume.", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Translation failed: {e}\n{len(done)} blocks saved. Run the same command again to resume.",
+              file=sys.stderr)
+        sys.exit(1)
+
+    write_output(args.transcript, client, args.target, done, output, args.format)
+    missing = len(pending) - len(done)
+    if missing:
+        # Keep the progress file so the next run only retries these
+        print(f"Wrote {output}; {missing} blocks could not be translated. "
+              f"Run the same command again to retry them.", file=sys.stderr)
+        sys.exit(1)
+    if os.path.exists(progress_path):
+        os.remove(progress_path)
+    print(f"Wrote {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()